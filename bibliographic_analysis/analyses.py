@@ -0,0 +1,407 @@
+import re
+
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from author_metrics import author_indicators, compute_author_metrics
+from author_table import build_author_table
+from centrality import adjacency, centralities
+from citation_matrices import co_citation_matrix, coupling_matrix, top_pairs
+from clustering import DEFAULT_RESOLUTION, DEFAULT_SEED, louvain
+from graph_layout import lod_graph
+from indicators import article_indicators
+from temporal import DEFAULT_STEP, DEFAULT_WIDTH, MIN_CLUSTER_SIZE, MIN_OVERLAP, cluster_evolution, window_clusters
+
+# Coupling strength options: raw shared references or a normalization of them
+COUPLING_STRENGTHS = {"Shared_Refs": None, "Cosine": "cosine", "Jaccard": "jaccard"}
+HIGHLY_CITED = 100
+MODEL_THRESHOLD = 5
+TOP_MEMBERS = 3
+
+
+# --- Performance analysis ---
+
+def author_metrics(df, table=None):
+    """Article count, citations, h-index and g-index of every author, from the corpus author table."""
+    table = build_author_table(df) if table is None else table
+    citations = df['Times Cited'].to_numpy()[table['article'].to_numpy()]
+    return compute_author_metrics(table['author'], citations)
+
+
+def indicator_tables(df, table=None):
+    """Every indicator per author, source and year, one wide table each."""
+    return {
+        "Authors": author_indicators(df, table),
+        "Sources": article_indicators(df, 'Source'),
+        "Publication Years": article_indicators(df, 'Publication year'),
+    }
+
+
+def missing_citations(df):
+    """
+    Articles without 'Times Cited' and their count per year ('Unknown' when the
+    year is missing too), largest first. Returns (articles, year table).
+    """
+    missing = df[df['Times Cited'].isna()][['Title', 'Publication year']]
+    year_counts = (missing
+                   .assign(**{'Publication year': missing['Publication year'].astype(object).fillna('Unknown')})
+                   .groupby('Publication year')
+                   .size()
+                   .sort_values(ascending=False))
+    year_table = year_counts.reset_index(name="Count")
+    year_table["Percentage"] = (year_table["Count"] / max(len(missing), 1) * 100).round(2)
+    return missing, year_table
+
+
+def highly_cited_articles(df, threshold=HIGHLY_CITED):
+    """Articles cited more than threshold times, by year and then by citations."""
+    high_cited = df[df["Times Cited"] > threshold][["Title", "Publication year", "Times Cited"]]
+    return high_cited.sort_values(["Publication year", "Times Cited"], ascending=[True, False])
+
+
+def articles_per_year(df):
+    counts = df["Publication year"].dropna().astype(int).value_counts().sort_index()
+    year_table = counts.reset_index()
+    year_table.columns = ["Publication Year", "Number of Articles"]
+    return year_table
+
+
+def citations_per_year(df):
+    """Publications, citations and average citations per paper of every publication year."""
+    years = df.dropna(subset=["Publication year"])
+    grouped = years.groupby(years["Publication year"].astype(int))
+    table = pd.DataFrame({"Publications": grouped.size(), "Citations": grouped["Times Cited"].sum()})
+    table["Average Citations per Paper"] = table["Citations"] / table["Publications"]
+    return table.rename_axis("Publication Year").reset_index()
+
+
+def lorenz_curve(values):
+    """(share of items, cumulative share of the total, Gini coefficient) of values sorted ascending."""
+    sorted_values = np.sort(np.asarray(values))
+    n = len(sorted_values)
+    cumulative = np.cumsum(sorted_values)
+    if n == 0 or cumulative[-1] == 0:
+        return np.zeros(0), np.zeros(0), float("nan")
+    gini = (n + 1 - 2 * np.sum(cumulative) / cumulative[-1]) / n
+    return np.arange(1, n + 1) / n, cumulative / cumulative[-1], gini
+
+
+def performance_tables(df, table=None, indicators=None):
+    """
+    Every table of the performance analysis, by output name. indicators are the
+    tables of indicator_tables when they are kept up to date elsewhere (incremental.CorpusState).
+    """
+    table = build_author_table(df) if table is None else table
+    metrics = author_metrics(df, table)
+    missing, missing_by_year = missing_citations(df)
+    _, _, gini = lorenz_curve(metrics["Total Citations"].to_numpy())
+    tables = {
+        "summary": pd.DataFrame({
+            "Metric": ["Unique Authors", "Total Citations", "Average Citations", "Gini Coefficient"],
+            "Value": [len(metrics), df['Times Cited'].sum(), df['Times Cited'].mean(), gini],
+        }),
+        "author_metrics": metrics,
+        "missing_citations": missing,
+        "missing_citations_by_year": missing_by_year,
+        "most_cited_articles_per_year": highly_cited_articles(df),
+        "authors_over_100_citations": metrics[metrics["Total Citations"] > HIGHLY_CITED]
+                                      .sort_values("Total Citations", ascending=False),
+        "articles_per_year": articles_per_year(df),
+        "citations_per_year": citations_per_year(df),
+    }
+    indicators = indicator_tables(df, table) if indicators is None else indicators
+    for name, indicator_table in indicators.items():
+        tables["indicators_" + name.lower().replace(" ", "_")] = indicator_table
+    return tables
+
+
+# --- Science mapping ---
+
+def reference_summary(index, n_records):
+    articles_with_refs = len(index.rows_with_references())
+    return {"Total References Found": int(index.row_sizes.sum()),
+            "Articles with References": articles_with_refs,
+            "Articles Missing References": n_records - articles_with_refs}
+
+
+def pair_graph(pairs):
+    """Weighted graph of a (first, second, weight) pair table."""
+    G = nx.Graph()
+    for first, second, weight in pairs.itertuples(index=False):
+        G.add_edge(first, second, weight=weight)
+    return G
+
+
+def matrix_communities(M, labels, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED):
+    """Louvain community (numbered from 1, largest first) of every node of the full pair matrix M, by label."""
+    W, nodes = adjacency(M)
+    return dict(zip(labels[nodes], louvain(W, resolution, seed) + 1))
+
+
+def graph_communities(G, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED):
+    """Louvain community (numbered from 1, largest first) of every node of the weighted graph G."""
+    W = nx.to_scipy_sparse_array(G, weight="weight", format="csr")
+    return dict(zip(G.nodes(), louvain(W, resolution, seed) + 1))
+
+
+def cluster_groups(G, communities):
+    """{cluster number: nodes} of the nodes of G."""
+    clusters = {}
+    for node in G.nodes():
+        clusters.setdefault(int(communities[node]), []).append(node)
+    return dict(sorted(clusters.items()))
+
+
+def _clusters(M, labels, pairs, resolution, seed, full_graph):
+    G = pair_graph(pairs)
+    communities = (matrix_communities(M, labels, resolution, seed) if full_graph
+                   else graph_communities(G, resolution, seed))
+    return pairs, G, cluster_groups(G, communities), communities
+
+
+def co_citation_pairs(index, counts=None):
+    """
+    Co-citation counts as the sparse product AᵀA of the article x reference matrix, with the reference labels.
+    counts are used instead when they are maintained already (incremental.CorpusState).
+    """
+    if counts is not None:
+        return counts, index.labels
+    return co_citation_matrix(index.incidence(index.rows_with_references())), index.labels
+
+
+def coupling_pairs(index, titles, strength="Shared_Refs", counts=None):
+    """
+    Bibliographic coupling of the articles with references (shared references AAᵀ), with their titles.
+    counts, when maintained already, is the coupling of every article at this strength.
+    """
+    if counts is not None:
+        return counts, pd.Series(titles).fillna("").astype(str).to_numpy(dtype=object)
+    rows = index.rows_with_references()
+    titles = pd.Series(titles).iloc[rows].fillna("").astype(str).to_numpy(dtype=object)
+    return coupling_matrix(index.incidence(rows), normalization=COUPLING_STRENGTHS[strength]), titles
+
+
+def co_citation_clusters(index, k=100, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED, full_graph=False,
+                         counts=None):
+    """
+    Top k co-citation pairs with their graph and its Louvain clusters. With
+    full_graph the clusters come from the whole weighted co-citation graph, not
+    only the top pairs; counts as in co_citation_pairs. Returns (pairs, G,
+    clusters of the nodes of G, community by reference).
+    """
+    M, labels = co_citation_pairs(index, counts)
+    return _clusters(M, labels, top_pairs(M, labels, k=k), resolution, seed, full_graph)
+
+
+def coupling_clusters(index, titles, strength="Shared_Refs", k=100, resolution=DEFAULT_RESOLUTION,
+                      seed=DEFAULT_SEED, full_graph=False, counts=None):
+    """Top k bibliographic coupling pairs of articles with their graph and its Louvain clusters, as co_citation_clusters."""
+    M, titles = coupling_pairs(index, titles, strength, counts)
+    pairs = top_pairs(M, titles, k=k, columns=('Article1', 'Article2', strength))
+    return _clusters(M, titles, pairs, resolution, seed, full_graph)
+
+
+def full_graph_lod(M, labels, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED):
+    """Level-of-detail graph (graph_layout.lod_graph) of the whole pair matrix M, its Louvain clusters as super-nodes."""
+    W, nodes = adjacency(M)
+    return lod_graph(W, labels[nodes], louvain(W, resolution, seed), seed=seed)
+
+
+def cluster_legend(G, clusters, column="Reference"):
+    """Node numbers "<cluster>-<rank by degree>" of every node of every cluster."""
+    rows = []
+    for cluster_id, nodes in clusters.items():
+        for idx, node in enumerate(sorted(nodes, key=G.degree, reverse=True), start=1):
+            rows.append({"Node": f"{cluster_id}-{idx}", column: node, "Cluster": cluster_id})
+    return pd.DataFrame(rows, columns=["Node", column, "Cluster"])
+
+
+def cluster_summary(clusters):
+    return pd.DataFrame({"Cluster": list(clusters), "Num_Nodes": [len(nodes) for nodes in clusters.values()]})
+
+
+def community_table(communities, column):
+    return pd.DataFrame({column: list(communities), "Cluster": list(communities.values())}) \
+        .sort_values(["Cluster", column], ignore_index=True)
+
+
+def co_citation_tables(df, index, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED, full_graph=False, counts=None):
+    pairs, G, clusters, communities = co_citation_clusters(index, resolution=resolution, seed=seed,
+                                                           full_graph=full_graph, counts=counts)
+    summary = reference_summary(index, len(df))
+    return {
+        "reference_summary": pd.DataFrame({"Metric": list(summary), "Value": list(summary.values())}),
+        "co_citation_pairs": pairs,
+        "co_citation_clusters": cluster_legend(G, clusters),
+        "co_citation_cluster_summary": cluster_summary(clusters),
+        "co_citation_communities": community_table(communities, "Reference"),
+    }
+
+
+def coupling_tables(df, index, strength="Shared_Refs", resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED,
+                    full_graph=False, counts=None):
+    pairs, G, clusters, communities = coupling_clusters(index, df['Title'], strength, resolution=resolution,
+                                                        seed=seed, full_graph=full_graph, counts=counts)
+    return {
+        "bibliographic_coupling_pairs": pairs,
+        "bibliographic_coupling_clusters": cluster_legend(G, clusters, "Article"),
+        "bibliographic_coupling_cluster_summary": cluster_summary(clusters),
+        "bibliographic_coupling_communities": community_table(communities, "Article"),
+    }
+
+
+# --- Temporal science mapping ---
+
+def window_label(window):
+    first, last = window
+    return str(first) if first == last else f"{first}-{last}"
+
+
+def window_summary(windows, results):
+    return pd.DataFrame({
+        "Window": [window_label(window) for window in windows],
+        "First_Year": [first for first, _ in windows],
+        "Last_Year": [last for _, last in windows],
+        "Articles": [result["articles"] for result in results],
+        "References": [result["references"] for result in results],
+        "Co_Citation_Clusters": [result["co_citation_members"].shape[0] for result in results],
+        "Co_Citation_Modularity": [result["co_citation"][3] for result in results],
+        "Coupling_Clusters": [result["coupling_members"].shape[0] for result in results],
+        "Coupling_Modularity": [result["coupling"][3] for result in results],
+    })
+
+
+def window_cluster_table(windows, results, graph, labels, column, top=TOP_MEMBERS):
+    """Size and most connected members of the tracked clusters of every window, one row per cluster."""
+    rows = []
+    for window, result in zip(windows, results):
+        nodes, communities, degrees, _ = result[graph]
+        members = pd.DataFrame({"Cluster": communities, column: labels[nodes], "Degree": degrees})
+        members = members[members["Cluster"] <= result[graph + "_members"].shape[0]] \
+            .sort_values(["Cluster", "Degree"], ascending=[True, False], kind="stable")
+        for cluster, cluster_members in members.groupby("Cluster"):
+            rows.append({"Window": window_label(window), "Cluster": cluster, "Size": len(cluster_members),
+                         f"Top_{column}s": "; ".join(cluster_members[column].head(top))})
+    return pd.DataFrame(rows, columns=["Window", "Cluster", "Size", f"Top_{column}s"])
+
+
+def evolution_table(windows, results, graph, min_overlap=MIN_OVERLAP):
+    """Continue, split, merge, emerge and dissolve events of the clusters between consecutive windows."""
+    rows = []
+    for i in range(1, len(windows)):
+        links = cluster_evolution(results[i - 1][graph + "_members"], results[i][graph + "_members"], min_overlap)
+        for before, after, overlap, event in links:
+            rows.append({"From_Window": window_label(windows[i - 1]), "From_Cluster": before,
+                         "To_Window": window_label(windows[i]), "To_Cluster": after,
+                         "Overlap": round(overlap, 3), "Event": event})
+    return pd.DataFrame(rows, columns=["From_Window", "From_Cluster", "To_Window", "To_Cluster", "Overlap", "Event"]) \
+        .astype({"From_Cluster": "Int64", "To_Cluster": "Int64"})
+
+
+def temporal_tables(df, index, width=DEFAULT_WIDTH, step=DEFAULT_STEP, strength="Shared_Refs",
+                    resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED, min_size=MIN_CLUSTER_SIZE,
+                    min_overlap=MIN_OVERLAP, workers=1):
+    """Co-citation and coupling clusters of every year window and their evolution between windows."""
+    windows, results = window_clusters(index, df['Publication year'], width, step, COUPLING_STRENGTHS[strength],
+                                       resolution, seed, min_size, workers)
+    titles = df['Title'].fillna("").astype(str).to_numpy(dtype=object)
+    return {
+        "temporal_windows": window_summary(windows, results),
+        "temporal_co_citation_clusters": window_cluster_table(windows, results, "co_citation", index.labels, "Reference"),
+        "temporal_coupling_clusters": window_cluster_table(windows, results, "coupling", titles, "Article"),
+        "temporal_co_citation_evolution": evolution_table(windows, results, "co_citation", min_overlap),
+        "temporal_coupling_evolution": evolution_table(windows, results, "coupling", min_overlap),
+    }
+
+
+# --- Network analysis ---
+
+def centrality_table(index, mode="approximate", workers=1, k=200):
+    """
+    Betweenness, eigenvector and closeness of every reference of the whole
+    co-citation graph, with the graph of the top k pairs for display.
+    Returns (table, G, timings).
+    """
+    co_citations, labels = co_citation_pairs(index)
+    W, nodes = adjacency(co_citations)
+    metrics, timings = centralities(W, mode=mode, workers=workers)
+    table = pd.DataFrame({'Node': labels[nodes], **metrics})
+    return table, pair_graph(top_pairs(co_citations, labels, k=k)), timings
+
+
+def centrality_tables(df, index, mode="approximate", workers=1):
+    table, _, timings = centrality_table(index, mode, workers)
+    return {
+        "centrality": table.sort_values(by='Betweenness', ascending=False),
+        "centrality_timings": pd.DataFrame({"Metric": list(timings), "Seconds": list(timings.values())}),
+    }
+
+
+# --- Models in articles ---
+
+def parse_models(df):
+    """
+    Articles and the models they mention, from a sheet of (status, data) rows: a
+    "TITLE" row starts an article and every following row is one of its models,
+    used by it when the status is "sim" and only cited otherwise.
+    Returns (articles, models) with articles as [{"article", "models"}] and
+    models as a DataFrame of article, model and used.
+    """
+    articles = []
+    models = []
+    current_article = None
+    for status, data in zip(df["status"].fillna("").astype(str), df["data"]):
+        if status == "TITLE":
+            current_article = data
+            articles.append({"article": current_article, "models": []})
+        elif current_article:
+            models.append({"article": current_article, "model": data, "used": status.strip().lower() == "sim"})
+            articles[-1]["models"].append(data)
+    models_df = pd.DataFrame(models, columns=["article", "model", "used"])
+    return articles, models_df.astype({"used": bool})
+
+
+def top_counts(counts, articles_without_models=0, threshold=MODEL_THRESHOLD):
+    """Counts of at least threshold, with the rest summed as "Other models"."""
+    counts = counts.sort_values(ascending=False)
+    top = counts[counts >= threshold].copy()
+    others = counts[counts < threshold].sum()
+    if others > 0:
+        top["Other models"] = others
+    if articles_without_models > 0:
+        top["Articles without models"] = articles_without_models
+    return top
+
+
+def cited_models_per_year(articles):
+    """Number of models of the articles whose title has a year, per year."""
+    years = []
+    for a in articles:
+        match = re.search(r"(19|20)\d{2}", a["article"])
+        if match:
+            years.extend([match.group(0)] * len(a["models"]))
+    return pd.Series(years, dtype=object).value_counts().sort_index()
+
+
+def model_tables(articles, models_df):
+    """Every table of the model analysis of parse_models' articles and models, by output name."""
+    summary = models_df.groupby("model").agg(
+        citations=("used", lambda x: (~x).sum()),
+        uses=("used", "sum")
+    ).reset_index()
+    years = cited_models_per_year(articles)
+    return {
+        "cited_models": models_df[~models_df["used"]]["model"].value_counts()
+                        .rename_axis("Model").reset_index(name="Citations"),
+        "used_models": models_df[models_df["used"]]["model"].value_counts()
+                       .rename_axis("Model").reset_index(name="Uses"),
+        "articles_without_models": pd.DataFrame([a["article"] for a in articles if len(a["models"]) == 0],
+                                                columns=["Articles Without Models"]),
+        "cited_models_by_year": pd.DataFrame({"Year": years.index, "Models": years.to_numpy()}),
+        "summary_table": summary,
+        "only_used_models": summary[(summary["citations"] == 0) & (summary["uses"] > 0)],
+        "only_cited_models": summary[(summary["citations"] > 0) & (summary["uses"] == 0)],
+        "used_more_than_cited": summary[summary["uses"] > summary["citations"]],
+        "cited_more_than_used": summary[summary["citations"] > summary["uses"]],
+    }
@@ -0,0 +1,26 @@
+from author_table import build_author_table, with_article_columns
+from indicators import GroupedCitations, indicator_table
+
+METRIC_COLUMNS = ["Author", "Number of Articles", "Total Citations", "Average Citations", "h-index", "g-index"]
+
+
+def compute_author_metrics(authors, citations):
+    """
+    Article count, total and average citations, h-index and g-index of every
+    author at once. authors and citations are parallel arrays with one entry per
+    (author, article); missing citations count as 0. Rows are sorted by author.
+    """
+    return indicator_table(GroupedCitations(authors, citations), "Author", METRIC_COLUMNS[1:])
+
+
+def author_indicators(df, table=None, current_year=None):
+    """
+    Every indicator of every author in one wide table, including the fractional
+    variants where each article counts 1 / (number of its authors).
+    table is the corpus author table, built when not given.
+    """
+    table = build_author_table(df) if table is None else table
+    rows = with_article_columns(table, df, ['Times Cited', 'Publication year'])
+    groups = GroupedCitations(rows['author'], rows['Times Cited'], rows['Publication year'],
+                              weights=1.0 / rows['number_of_authors'], current_year=current_year)
+    return indicator_table(groups, "Author")
@@ -0,0 +1,93 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+AUTHOR_TABLE_SUFFIX = ".authors.parquet"
+ADDRESS_PATTERN = re.compile(r"\[([^\]]*)\]\s*([^\[]*)")
+
+
+def split_authors(authors):
+    """Authors of an 'Authors' cell ("Smith J, Doe A"), stripped and with collapsed whitespace."""
+    if pd.isna(authors):
+        return []
+    return [" ".join(author.split()) for author in str(authors).split(',') if author.strip()]
+
+
+def author_key(name):
+    """(last name, first initial) of "Smith J" (Authors) or "Smith, John" (Author Address) names."""
+    if "," in name:
+        last, given = name.split(",", 1)
+    else:
+        last, _, given = name.strip().rpartition(" ")
+    return last.strip().casefold(), given.strip()[:1].casefold()
+
+
+def parse_addresses(address):
+    """
+    Affiliations of a WoS 'Author Address' (C1) cell as {author key: first address}.
+    "[Smith, John; Doe, Ann] Univ X, City, Country; [Lee, K] Univ Y, ..." gives the
+    address after each bracket to the authors inside it; an address without a
+    bracketed author list applies to every author and is returned under None.
+    """
+    if pd.isna(address):
+        return {}
+    affiliations = {}
+    matches = ADDRESS_PATTERN.findall(str(address))
+    if not matches:
+        return {None: str(address).split(";")[0].strip(" .")}
+    for names, place in matches:
+        place = place.strip().rstrip(";").strip(" .")
+        for name in names.split(";"):
+            affiliations.setdefault(author_key(name), place)
+    return affiliations
+
+
+def build_author_table(df):
+    """
+    Long author table of a corpus: one row per (article, author) with
+    article (corpus row), author (categorical), position (0 for the first author),
+    number_of_authors and affiliation (categorical, from 'Author Address' when present).
+    """
+    articles, authors, positions, counts, affiliations = [], [], [], [], []
+    addresses = df['Author Address'] if 'Author Address' in df.columns else pd.Series(np.nan, index=df.index)
+    for row, (cell, address) in enumerate(zip(df['Authors'], addresses)):
+        names = split_authors(cell)
+        places = parse_addresses(address)
+        for position, name in enumerate(names):
+            articles.append(row)
+            authors.append(name)
+            positions.append(position)
+            counts.append(len(names))
+            affiliations.append(places.get(author_key(name), places.get(None)))
+
+    return pd.DataFrame({
+        "article": np.asarray(articles, dtype=np.int32),
+        "author": pd.Categorical(authors),
+        "position": np.asarray(positions, dtype=np.int16),
+        "number_of_authors": np.asarray(counts, dtype=np.int16),
+        "affiliation": pd.Categorical(affiliations),
+    })
+
+
+def author_table_path(corpus_path):
+    return os.path.splitext(corpus_path)[0] + AUTHOR_TABLE_SUFFIX
+
+
+def load_or_build_author_table(df, corpus_path=None):
+    """Load the author table persisted next to corpus_path, building and saving it when missing or stale."""
+    path = author_table_path(corpus_path) if corpus_path is not None else None
+    if path is not None and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(corpus_path):
+        # A column without any affiliation is read back as floats
+        return pd.read_parquet(path).astype({"author": "category", "affiliation": "category"})
+    table = build_author_table(df)
+    if path is not None:
+        table.to_parquet(path, index=False)
+    return table
+
+
+def with_article_columns(table, df, columns):
+    """The author table with the given corpus columns of each row's article added."""
+    values = {column: df[column].to_numpy()[table['article'].to_numpy()] for column in columns}
+    return table.assign(**values)
@@ -0,0 +1,492 @@
+# Benchmarks of the analysis engines against the implementations they replaced.
+# Usage: python benchmarks.py [benchmark ...]
+
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from pyvis.network import Network
+from scipy.stats import spearmanr
+
+from author_metrics import compute_author_metrics
+from author_table import build_author_table
+from centrality import adjacency, centralities
+from clustering import louvain, modularity
+from graph_export import centrality_attributes, static_network
+from graph_layout import lod_graph
+from graph_render import render_html
+from incremental import CorpusState
+from reference_index import ReferenceIndex
+from temporal import publication_years, window_clusters, year_windows
+from citation_matrices import build_incidence, co_citation_matrix, coupling_matrix, top_pairs
+from reference_matching import block_keys, clean_text, find_duplicates, shingles, similar
+
+ERROR_REFERENCES = os.path.join(os.path.dirname(__file__), "..", "data", "errorOnReferences.txt")
+
+
+def sample_reference_lists(articles, refs_per_article, vocabulary, seed=0):
+    """Synthetic reference lists whose cited works follow a Zipf-like popularity."""
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, vocabulary + 1)
+    popularity /= popularity.sum()
+    lists = []
+    for _ in range(articles):
+        size = max(1, int(rng.poisson(refs_per_article)))
+        lists.append([f"Reference {i}" for i in rng.choice(vocabulary, size=min(size, vocabulary), replace=False, p=popularity)])
+    return lists
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def co_citation_pairs_loop(reference_lists):
+    # Previous implementation: every pair of every article as a Python tuple
+    all_pairs = []
+    for refs in reference_lists:
+        for combo in itertools.combinations(sorted(set(refs)), 2):
+            all_pairs.append(combo)
+    pairs_df = pd.DataFrame(all_pairs, columns=['Ref1', 'Ref2'])
+    return pairs_df.value_counts().reset_index(name='Count')
+
+
+def co_citation_pairs_sparse(reference_lists, k=None):
+    A, labels = build_incidence(reference_lists)
+    return top_pairs(co_citation_matrix(A), labels, k=k)
+
+
+def benchmark_co_citation():
+    print("Co-citation: itertools pairs + value_counts vs sparse AᵀA")
+    for articles, refs in [(500, 40), (2000, 60), (5000, 100)]:
+        reference_lists = sample_reference_lists(articles, refs, vocabulary=articles * 10)
+        loop, loop_time = timed(co_citation_pairs_loop, reference_lists)
+        sparse_counts, sparse_time = timed(co_citation_pairs_sparse, reference_lists)
+        _, top_time = timed(co_citation_pairs_sparse, reference_lists, k=100)
+        same = loop.set_index(['Ref1', 'Ref2'])['Count'].sort_index().equals(
+            sparse_counts.set_index(['Ref1', 'Ref2'])['Count'].astype(loop['Count'].dtype).sort_index())
+        print(f"  {articles} articles x ~{refs} refs: loop {loop_time:.2f}s, sparse {sparse_time:.2f}s, "
+              f"sparse top-100 {top_time:.2f}s, same counts: {same}")
+
+
+def coupling_pairs_loop(reference_strings):
+    # Previous implementation: nested loop re-splitting the inner article's references
+    pairs = []
+    for idx1, refs1 in enumerate(reference_strings):
+        refs1_set = {r.strip() for r in refs1.split(';') if r.strip()}
+        for idx2 in range(idx1 + 1, len(reference_strings)):
+            refs2_set = {r.strip() for r in reference_strings[idx2].split(';') if r.strip()}
+            shared_refs = refs1_set & refs2_set
+            if shared_refs:
+                pairs.append((idx1, idx2, len(shared_refs)))
+    return pairs
+
+
+def coupling_pairs_sparse(reference_strings, workers=1):
+    A, _ = build_incidence([r.strip() for r in refs.split(';') if r.strip()] for refs in reference_strings)
+    return coupling_matrix(A, workers=workers, block_size=500)
+
+
+def benchmark_coupling():
+    print("Bibliographic coupling: nested set intersections vs sparse AAᵀ")
+    for articles, refs in [(500, 40), (2000, 40), (8000, 40)]:
+        reference_strings = ["; ".join(refs) for refs in sample_reference_lists(articles, refs, vocabulary=articles * 10)]
+        if articles <= 2000:
+            loop, loop_time = timed(coupling_pairs_loop, reference_strings)
+            loop_text = f"loop {loop_time:.2f}s"
+        else:
+            loop, loop_text = None, "loop skipped"
+        coupling, sparse_time = timed(coupling_pairs_sparse, reference_strings)
+        _, parallel_time = timed(coupling_pairs_sparse, reference_strings, workers=4)
+        same = ""
+        if loop is not None:
+            same = f", same pairs: {sorted(loop) == sorted(zip(coupling.row.tolist(), coupling.col.tolist(), coupling.data.tolist()))}"
+        print(f"  {articles} articles x ~{refs} refs: {loop_text}, sparse {sparse_time:.2f}s, "
+              f"sparse 4 workers {parallel_time:.2f}s{same}")
+
+
+def error_file_references(path=ERROR_REFERENCES):
+    """Reference strings of the Crossref references logged in errorOnReferences.txt (title and JSON lines alternate)."""
+    references = []
+    with open(path, encoding="utf-8") as f:
+        for line in itertools.islice(f, 1, None, 2):
+            reference = json.loads(line)
+            title = reference.get("volume-title") or reference.get("series-title") or reference.get("journal-title")
+            parts = [reference.get("author"), reference.get("year"), title, reference.get("volume"), reference.get("first-page")]
+            if title:
+                references.append(", ".join(part for part in parts if part))
+    return references
+
+
+def perturbed_references(references, copies, seed=0):
+    """The references plus `copies` variants of each with dropped punctuation, changed case or a truncated tail."""
+    rng = np.random.default_rng(seed)
+    variants = list(references)
+    for _ in range(copies):
+        for reference in references:
+            choice = rng.integers(3)
+            if choice == 0:
+                variants.append(reference.replace(",", "").replace(".", ""))
+            elif choice == 1:
+                variants.append(reference.upper())
+            else:
+                variants.append(reference[:max(len(reference) - int(rng.integers(1, 6)), 1)])
+    return variants
+
+
+def duplicate_pairs_brute_force(texts, threshold=0.8):
+    # Every pair compared: the quadratic baseline that blocking and LSH avoid
+    shingle_sets = [shingles(clean_text(text)) for text in texts]
+    return [(i, j) for i, j in itertools.combinations(range(len(texts)), 2)
+            if similar(shingle_sets[i], shingle_sets[j], threshold)]
+
+
+def benchmark_reference_matching():
+    print("Reference deduplication: all pairs vs blocking + MinHash LSH")
+    references = [text.casefold() for text in error_file_references()]
+    for copies in [0, 1, 3]:
+        texts = perturbed_references(references, copies)
+        lsh, lsh_time = timed(find_duplicates, texts)
+        if len(texts) <= 3000:
+            exact, exact_time = timed(duplicate_pairs_brute_force, texts)
+            # Pairs in different blocks (e.g. editions of other years) are left apart on purpose
+            blocks = [set(block_keys(clean_text(text))) for text in texts]
+            blocked = {(i, j) for i, j in exact if blocks[i] & blocks[j]}
+            recall = len(set(lsh) & blocked) / len(blocked) if blocked else 1.0
+            exact_text = (f"all pairs {exact_time:.2f}s ({len(exact)} pairs, {len(blocked)} sharing a block), "
+                          f"LSH recall within blocks {recall:.3f}")
+        else:
+            exact_text = "all pairs skipped"
+        print(f"  {len(texts)} references: LSH {lsh_time:.2f}s ({len(lsh)} pairs), {exact_text}")
+
+
+def centralities_networkx(W):
+    # Previous implementation: networkx on the graph (hop distances, weighted eigenvector)
+    G = nx.from_scipy_sparse_array(W)
+    nodes = range(W.shape[0])
+    betweenness = nx.betweenness_centrality(G, weight=None)
+    eigenvector = nx.eigenvector_centrality(G, max_iter=1000, weight='weight')
+    closeness = nx.closeness_centrality(G)
+    return {name: np.array([values[v] for v in nodes])
+            for name, values in [('Betweenness', betweenness), ('Eigenvector', eigenvector), ('Closeness', closeness)]}
+
+
+def benchmark_centrality():
+    print("Centrality: networkx vs sparse exact vs sampled pivots (Spearman rank agreement with exact)")
+    for articles, refs in [(100, 20), (400, 20), (1500, 20)]:
+        A, _ = build_incidence(sample_reference_lists(articles, refs, vocabulary=articles * 5))
+        W, _ = adjacency(co_citation_matrix(A))
+        (exact, _), exact_time = timed(centralities, W, mode="exact")
+        (approximate, _), approximate_time = timed(centralities, W, mode="approximate")
+        agreement = ", ".join(f"{name} {spearmanr(exact[name], approximate[name])[0]:.3f}" for name in exact)
+        if W.shape[0] <= 1000:
+            reference, networkx_time = timed(centralities_networkx, W)
+            same = all(np.allclose(reference[name], exact[name], atol=1e-6) for name in exact)
+            networkx_text = f"networkx {networkx_time:.2f}s (same values: {same})"
+        else:
+            networkx_text = "networkx skipped"
+        print(f"  {W.shape[0]} nodes, {W.nnz // 2} edges: {networkx_text}, exact {exact_time:.2f}s, "
+              f"approximate {approximate_time:.2f}s ({agreement})")
+
+
+def benchmark_parallel_centrality():
+    print("Centrality: one process vs a shared process pool (per-metric CPU seconds)")
+    A, _ = build_incidence(sample_reference_lists(1500, 20, vocabulary=7500))
+    W, _ = adjacency(co_citation_matrix(A))
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        (values, timings), _ = timed(centralities, W, mode="exact", workers=workers)
+        per_metric = ", ".join(f"{metric} {seconds:.2f}s" for metric, seconds in timings.items() if metric != "Total")
+        print(f"  {W.shape[0]} nodes, {workers} workers: {timings['Total']:.2f}s elapsed ({per_metric})")
+
+
+def h_index(citations):
+    citations = sorted(citations, reverse=True)
+    return sum(c >= i + 1 for i, c in enumerate(citations))
+
+
+def g_index(citations):
+    citations = sorted(citations, reverse=True)
+    total = 0
+    g = 0
+    for i, c in enumerate(citations, start=1):
+        total += c
+        if total >= i**2:
+            g = i
+    return g
+
+
+def author_metrics_loop(df):
+    # Previous implementation: split the authors of every article, then one Python pass per author group
+    df_authors = df.assign(Authors=df['Authors'].astype(str).str.split(',')).explode('Authors')
+    df_authors['Authors'] = df_authors['Authors'].str.strip()
+    results = []
+    for author, group in df_authors.groupby("Authors"):
+        citations = group['Times Cited'].fillna(0).astype(int).tolist()
+        results.append({
+            "Author": author,
+            "Number of Articles": len(citations),
+            "Total Citations": sum(citations),
+            "Average Citations": sum(citations) / len(citations) if citations else 0,
+            "h-index": h_index(citations),
+            "g-index": g_index(citations)
+        })
+    return pd.DataFrame(results)
+
+
+def sample_author_corpus(articles, authors, seed=0):
+    """Synthetic corpus whose articles have 1-5 authors and heavy-tailed citation counts, some missing."""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Author {i}" for i in range(authors)], dtype=object)
+    citations = np.floor(rng.pareto(1.5, size=articles) * 5).astype(float)
+    citations[rng.random(articles) < 0.05] = np.nan
+    return pd.DataFrame({
+        "Authors": [", ".join(rng.choice(names, size=rng.integers(1, 6), replace=False)) for _ in range(articles)],
+        "Times Cited": citations,
+    })
+
+
+def benchmark_author_metrics():
+    print("Author metrics: split + per-author loop vs author table + vectorized h/g-index")
+    for articles, authors in [(1000, 2000), (10000, 20000), (50000, 100000)]:
+        df = sample_author_corpus(articles, authors)
+        loop, loop_time = timed(author_metrics_loop, df)
+        table, table_time = timed(build_author_table, df)
+        citations = df['Times Cited'].to_numpy()[table['article'].to_numpy()]
+        vectorized, vectorized_time = timed(compute_author_metrics, table['author'], citations)
+        same = loop.astype(vectorized.dtypes.to_dict()).equals(vectorized)
+        print(f"  {articles} articles, {vectorized.shape[0]} authors: loop {loop_time:.2f}s, "
+              f"author table (once per corpus) {table_time:.2f}s, vectorized {vectorized_time:.3f}s, "
+              f"same results: {same}")
+
+
+def reference_texts(vocabulary, seed=0):
+    """Distinct citation-like texts ("Author (year) four title words") for the reference ids."""
+    rng = np.random.default_rng(seed)
+    syllables = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se", "ti", "vo", "zu"]
+    words = np.array(["".join(rng.choice(syllables, size=3)) for _ in range(2000)], dtype=object)
+    return [f"{rng.choice(words).title()} ({rng.integers(1990, 2025)}) {' '.join(rng.choice(words, size=4))}"
+            for _ in range(vocabulary)]
+
+
+def sample_corpus(articles, seed=0, vocabulary=None):
+    """Synthetic corpus with authors, citations, sources, years and reference lists."""
+    rng = np.random.default_rng(seed)
+    vocabulary = vocabulary or articles * 5
+    texts = reference_texts(vocabulary)
+    df = sample_author_corpus(articles, authors=articles * 2, seed=seed)
+    reference_lists = sample_reference_lists(articles, 30, vocabulary=vocabulary, seed=seed)
+    return df.assign(
+        Title=[f"Article {seed}-{i}" for i in range(articles)],
+        Source=[f"Journal {i}" for i in rng.integers(0, max(articles // 50, 1), size=articles)],
+        **{"Publication year": rng.integers(2000, 2025, size=articles),
+           "Article References": ["; ".join(texts[int(ref.split()[1])] for ref in refs) for refs in reference_lists]},
+    )
+
+
+def same_tables(state, rebuilt):
+    """Whether the indicator tables of an updated state equal those of a full rebuild."""
+    for name, table in rebuilt.tables.items():
+        key = table.columns[0]
+        updated = state.tables[name].sort_values(key, ignore_index=True)
+        try:
+            pd.testing.assert_frame_equal(updated, table.sort_values(key, ignore_index=True), check_dtype=False)
+        except AssertionError:
+            return False
+    return True
+
+
+def same_co_citation(state, rebuilt):
+    """Whether an updated state counts the same co-citations as a full rebuild, merged references included."""
+    return np.array_equal(np.sort(state.co_citation.data), np.sort(rebuilt.co_citation.data))
+
+
+def benchmark_incremental():
+    print("Incremental update: full rebuild vs applying a 1% delta to the persisted state")
+    for articles in [2000, 5000, 10000]:
+        corpus = sample_corpus(articles)
+        month = sample_corpus(articles // 100, seed=1, vocabulary=articles * 5)
+        state, _ = timed(CorpusState.build, corpus)
+        # Updates start from the state as persisted between runs
+        with tempfile.TemporaryDirectory() as directory:
+            state.save(directory)
+            state = CorpusState.load(directory)
+        updated = pd.concat([corpus, month], ignore_index=True)
+        _, rebuild_time = timed(CorpusState.build, updated)
+        summary, update_time = timed(state.update, updated)
+        print(f"  {articles} + {summary['added']} articles: rebuild {rebuild_time:.2f}s, update {update_time:.2f}s "
+              f"(same tables: {same_tables(state, CorpusState.build(updated))})")
+        # Articles of a new latest year move the current year of m-quotient and hc-index
+        next_year = sample_corpus(articles // 100, seed=2, vocabulary=articles * 5) \
+            .assign(**{"Publication year": corpus["Publication year"].max() + 1})
+        updated = pd.concat([updated, next_year], ignore_index=True)
+        summary, update_time = timed(state.update, updated)
+        print(f"  {articles} + {summary['added']} articles of a new year: update {update_time:.2f}s "
+              f"(same tables: {same_tables(state, CorpusState.build(updated))})")
+        # Articles citing truncated forms of known references, merged by the delta deduplication
+        truncated = sample_corpus(articles // 100, seed=3, vocabulary=articles * 5)
+        truncated["Article References"] = ["; ".join(reference[:-3] for reference in references.split("; "))
+                                           for references in truncated["Article References"]]
+        updated = pd.concat([updated, truncated], ignore_index=True)
+        summary, update_time = timed(state.update, updated)
+        rebuilt = CorpusState.build(updated)
+        print(f"  {articles} + {summary['added']} articles citing variants of known references: update "
+              f"{update_time:.2f}s (same tables: {same_tables(state, rebuilt)}, "
+              f"same co-citations: {same_co_citation(state, rebuilt)})")
+
+
+def benchmark_clustering():
+    print("Clustering: networkx greedy modularity and Louvain vs sparse Louvain (modularity of the clusters)")
+    for articles, refs in [(200, 20), (1000, 20), (4000, 20)]:
+        A, _ = build_incidence(sample_reference_lists(articles, refs, vocabulary=articles * 5))
+        W, _ = adjacency(co_citation_matrix(A))
+        G = nx.from_scipy_sparse_array(W)
+        labels, louvain_time = timed(louvain, W, seed=0)
+        results = [f"sparse Louvain {louvain_time:.2f}s (Q {modularity(W, labels):.3f}, {labels.max() + 1} clusters)"]
+        louvain_nx, louvain_nx_time = timed(nx.community.louvain_communities, G, seed=0)
+        results.append(f"networkx Louvain {louvain_nx_time:.2f}s (Q {nx.community.modularity(G, louvain_nx):.3f})")
+        if W.shape[0] <= 2000:
+            greedy, greedy_time = timed(nx.community.greedy_modularity_communities, G, weight="weight")
+            results.append(f"greedy {greedy_time:.2f}s (Q {nx.community.modularity(G, greedy):.3f})")
+        print(f"  {W.shape[0]} nodes, {W.nnz // 2} edges: " + ", ".join(results))
+
+
+def benchmark_layout():
+    print("Layout: networkx spring layout vs sparse two-level layout with cluster super-nodes")
+    for articles, refs in [(200, 20), (1000, 20), (4000, 20)]:
+        A, _ = build_incidence(sample_reference_lists(articles, refs, vocabulary=articles * 5))
+        W, _ = adjacency(co_citation_matrix(A))
+        communities = louvain(W, seed=0)
+        graph, lod_time = timed(lod_graph, W, np.arange(W.shape[0]), communities)
+        if W.shape[0] <= 4000:
+            _, spring_time = timed(nx.spring_layout, nx.from_scipy_sparse_array(W), seed=0)
+            spring_text = f"networkx spring {spring_time:.2f}s"
+        else:
+            spring_text = "networkx spring skipped"
+        print(f"  {W.shape[0]} nodes, {W.nnz // 2} edges: {spring_text}, level of detail {lod_time:.2f}s "
+              f"({len(graph['clusters'])} super-nodes, {len(graph['edges'])} of the edges kept)")
+
+
+def centrality_network_loop(G, positions, betweenness, eigenvector, closeness, metric):
+    """The centrality graph built node by node with Network.add_node and add_edge."""
+    net = Network(height="600px", width="100%", notebook=False, bgcolor="#ffffff", font_color="black")
+    net.toggle_physics(False)
+    top10_betweenness = sorted(G.nodes(), key=betweenness.get, reverse=True)[:10]
+    top10_eigenvector = sorted(G.nodes(), key=eigenvector.get, reverse=True)[:10]
+    top10_closeness = sorted(G.nodes(), key=closeness.get, reverse=True)[:10]
+    metric_values = {"Betweenness": betweenness, "Eigenvector": eigenvector, "Closeness": closeness}[metric]
+    for node in G.nodes():
+        if node in top10_betweenness:
+            color = "red"
+        elif node in top10_eigenvector:
+            color = "blue"
+        elif node in top10_closeness:
+            color = "green"
+        else:
+            color = "lightgray"
+        border = 5 if node in top10_betweenness + top10_eigenvector + top10_closeness else 1
+        net.add_node(node, label=node, size=15 + metric_values[node]*50, color=color, borderWidth=border,
+                     x=positions[node][0], y=positions[node][1], physics=False,
+                     title=f"Betweenness: {betweenness[node]:.4f}\n"
+                           f"Eigenvector: {eigenvector[node]:.4f}\n"
+                           f"Closeness: {closeness[node]:.4f}")
+    for u, v, data in G.edges(data=True):
+        net.add_edge(u, v, value=data['weight'])
+    return net
+
+
+def benchmark_graph_export():
+    print("Graph export: pyvis add_node / add_edge loop vs node attributes precomputed in one pass")
+    rng = np.random.default_rng(0)
+    for nodes in [200, 1000, 3000, 10000]:
+        G = nx.gnm_random_graph(nodes, nodes * 3, seed=0)
+        G = nx.relabel_nodes(G, {node: f"Reference {node}" for node in G})
+        nx.set_edge_attributes(G, {edge: int(weight) for edge, weight in zip(G.edges(), rng.integers(1, 10, G.number_of_edges()))}, "weight")
+        positions = {node: tuple(rng.random(2) * 1000) for node in G}
+        scores = [dict(zip(G, rng.random(nodes))) for _ in range(3)]
+        _, vectorized_time = timed(lambda: static_network(G, G.nodes(), positions,
+                                                            **centrality_attributes(G.nodes(), *scores, "Betweenness")))
+        if nodes <= 3000:
+            # Same nodes and edges as the loop: checked by test_graph_export.py
+            _, loop_time = timed(centrality_network_loop, G, positions, *scores, "Betweenness")
+            loop_text = f"loop {loop_time:.2f}s"
+        else:
+            loop_text = "loop skipped"
+        print(f"  {nodes} nodes, {G.number_of_edges()} edges: {loop_text}, vectorized {vectorized_time:.3f}s")
+
+
+def save_and_reread(net, path):
+    net.save_graph(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def benchmark_rendering():
+    print("Rendering: save_graph and re-read vs in-memory HTML (first render, then cached)")
+    rng = np.random.default_rng(0)
+    for nodes in [200, 1000, 5000]:
+        G = nx.gnm_random_graph(nodes, nodes * 3, seed=0)
+        nx.set_edge_attributes(G, 1, "weight")
+        positions = {node: tuple(rng.random(2) * 1000) for node in G}
+        net = static_network(G, G.nodes(), positions)
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                net.cdn_resources = "local"
+                _, file_time = timed(save_and_reread, net, "graph.html")
+            finally:
+                os.chdir(cwd)
+        _, first_time = timed(render_html, net)
+        _, cached_time = timed(render_html, static_network(G, G.nodes(), positions))
+        print(f"  {nodes} nodes: file {file_time:.3f}s, in memory {first_time:.3f}s, cached {cached_time:.3f}s")
+
+
+def rebuilt_windows(df, width, step):
+    """Every year window as a corpus of its own: references parsed and indexed again for each window."""
+    years = publication_years(df["Publication year"])
+    for first, last in year_windows(years, width, step):
+        window = df[(years >= first) & (years <= last)]
+        window_clusters(ReferenceIndex.build(window["Article References"]), window["Publication year"], width, width)
+
+
+def benchmark_temporal():
+    print("Temporal mapping: one corpus run vs 5-year windows rebuilt per window or sliced from one shared index")
+    for articles in [1000, 3000]:
+        corpus = sample_corpus(articles)
+        index, index_time = timed(ReferenceIndex.build, corpus["Article References"])
+        _, full_time = timed(window_clusters, index, np.zeros(articles), width=1, step=1)
+        results = [f"one run {index_time + full_time:.2f}s"]
+        for step in (5, 1):
+            _, rebuilt_time = timed(rebuilt_windows, corpus, 5, step)
+            _, shared_time = timed(window_clusters, index, corpus["Publication year"], width=5, step=step)
+            _, parallel_time = timed(window_clusters, index, corpus["Publication year"], width=5, step=step, workers=4)
+            results.append(f"step {step}: rebuilt {rebuilt_time:.2f}s, shared index {index_time + shared_time:.2f}s, "
+                           f"4 processes {index_time + parallel_time:.2f}s")
+        print(f"  {articles} articles: " + ", ".join(results))
+
+
+BENCHMARKS = {
+    "co_citation": benchmark_co_citation,
+    "coupling": benchmark_coupling,
+    "reference_matching": benchmark_reference_matching,
+    "centrality": benchmark_centrality,
+    "parallel_centrality": benchmark_parallel_centrality,
+    "clustering": benchmark_clustering,
+    "layout": benchmark_layout,
+    "graph_export": benchmark_graph_export,
+    "rendering": benchmark_rendering,
+    "temporal": benchmark_temporal,
+    "author_metrics": benchmark_author_metrics,
+    "incremental": benchmark_incremental,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
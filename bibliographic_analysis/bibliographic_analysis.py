@@ -1,25 +1,42 @@
+import os
+
 import streamlit as st
 
 import network_analysis
 import performance_analysis
 import qualitative_analysis
 import science_mapping
+from corpus import CORPUS_TYPES
+from session import load_corpus_file, load_uploaded_corpus
 
 st.set_page_config(page_title="Bibliographic Analysis", layout="wide")
 
 st.title("Bibliographic Analysis")
 
+# One corpus shared by every tab; parsing is cached by file content
+uploaded_file = st.sidebar.file_uploader("Upload corpus file (Parquet, Arrow or Excel)", type=CORPUS_TYPES)
+# A corpus on the server is read with the sidecars data_preparation persisted next to it
+corpus_path = st.sidebar.text_input("Or open a corpus file on the server (path)").strip()
+df, corpus_key = None, None
+if uploaded_file:
+    df, corpus_key = load_uploaded_corpus(uploaded_file)
+elif corpus_path:
+    if os.path.isfile(corpus_path):
+        df, corpus_key = load_corpus_file(corpus_path)
+    else:
+        st.sidebar.error(f"No corpus file at {corpus_path}")
+
 tabs = st.tabs(["Performance Analysis", "Network Analysis", "Science Mapping", "Quantitative Analysis - Models"])
 
 
 with tabs[0]:
-    performance_analysis.show()
+    performance_analysis.show(df, corpus_key)
 
 with tabs[1]:
-    network_analysis.show()
+    network_analysis.show(df, corpus_key)
 
 with tabs[2]:
-    science_mapping.show()
+    science_mapping.show(df, corpus_key)
 
 with tabs[3]:
     qualitative_analysis.show()
@@ -0,0 +1,239 @@
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+MODES = ("exact", "approximate")
+METRICS = ("Betweenness", "Eigenvector", "Closeness")
+DEFAULT_PIVOTS = 256
+DEFAULT_BATCH_SIZE = 64
+
+# Weighted and 0/1 adjacency shared with the worker processes, set once per worker
+_worker_graph = None
+_worker_binary = None
+
+
+def adjacency(M):
+    """
+    Symmetric weighted CSR adjacency of the graph whose edges are the entries of
+    the pair matrix M (e.g. the upper triangle of a co-citation matrix).
+    Nodes without edges are dropped; returns (W, nodes) where nodes[i] is the
+    row/column of M that node i stands for.
+    """
+    M = sparse.coo_matrix(M)
+    W = (M + M.T).tocsr()
+    nodes = np.flatnonzero(np.diff(W.indptr) > 0)
+    W = W[nodes][:, nodes]
+    W.sort_indices()
+    return W, nodes
+
+
+def _binary(W):
+    B = sparse.csr_matrix(W, dtype=np.float64, copy=True)
+    B.data[:] = 1.0
+    return B
+
+
+def _sample(n, k, seed):
+    if k is None or k >= n:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+
+
+def _bfs(B, sources, count_paths=True):
+    """
+    Breadth-first search from a batch of sources at once, one sparse product per level.
+    Returns (dist, sigma): hop distances (-1 when unreachable) and, with count_paths,
+    the number of shortest paths, both of shape (nodes, sources).
+    """
+    n, columns = B.shape[0], np.arange(len(sources))
+    dist = np.full((n, len(sources)), -1, dtype=np.int32)
+    dist[sources, columns] = 0
+    frontier = np.zeros((n, len(sources)))
+    frontier[sources, columns] = 1.0
+    sigma = frontier.copy() if count_paths else None
+
+    level = 0
+    while True:
+        level += 1
+        reached = B @ frontier
+        new = (reached > 0) & (dist < 0)
+        if not new.any():
+            return dist, sigma
+        dist[new] = level
+        if count_paths:
+            sigma[new] = reached[new]
+            frontier = np.where(new, reached, 0.0)
+        else:
+            frontier = new.astype(np.float64)
+
+
+def _dependencies(B, sources, batch_size=DEFAULT_BATCH_SIZE):
+    """Unnormalized Brandes dependencies of every node, summed over the given sources."""
+    betweenness = np.zeros(B.shape[0])
+    for start in range(0, len(sources), batch_size):
+        batch = sources[start:start + batch_size]
+        dist, sigma = _bfs(B, batch)
+        delta = np.zeros_like(sigma)
+        for level in range(dist.max(), 0, -1):
+            # Dependencies flow from each level to its predecessors on the level above
+            coefficient = np.where(dist == level, (1.0 + delta) / np.where(sigma > 0, sigma, 1.0), 0.0)
+            delta += np.where(dist == level - 1, sigma * (B @ coefficient), 0.0)
+        delta[batch, np.arange(len(batch))] = 0.0
+        betweenness += delta.sum(axis=1)
+    return betweenness
+
+
+def eigenvector_centrality(W, max_iter=1000, tol=1e-6):
+    """Weighted eigenvector centrality by power iteration on W + I, normalized to unit length."""
+    n = W.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = x
+        x = W @ x + x
+        norm = np.linalg.norm(x)
+        x = x / norm if norm > 0 else x
+        if np.abs(x - previous).sum() < n * tol:
+            return x
+    raise RuntimeError(f"Eigenvector centrality did not converge in {max_iter} iterations")
+
+
+def _distance_sums(B, nodes, sources, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Sum over the sources of the hop distance to each node of the connected
+    component `nodes`; sources are positions within the component.
+    """
+    B = B[nodes][:, nodes]
+    sums = np.zeros(len(nodes))
+    for start in range(0, len(sources), batch_size):
+        dist, _ = _bfs(B, sources[start:start + batch_size], count_paths=False)
+        sums += dist.sum(axis=1)
+    return sums
+
+
+def _components(B):
+    """Connected components with more than one node, as arrays of node ids."""
+    _, labels = csgraph.connected_components(B, directed=False)
+    order = np.argsort(labels, kind="stable")
+    return [c for c in np.split(order, np.flatnonzero(np.diff(labels[order])) + 1) if len(c) > 1]
+
+
+def _chunks(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def _run_task(W, B, metric, args):
+    start = time.perf_counter()
+    if metric == "Betweenness":
+        result = _dependencies(B, *args)
+    elif metric == "Eigenvector":
+        result = eigenvector_centrality(W)
+    else:
+        result = _distance_sums(B, *args)
+    return result, time.perf_counter() - start
+
+
+def _init_worker(W):
+    global _worker_graph, _worker_binary
+    _worker_graph = W
+    _worker_binary = _binary(W)
+
+
+def _run_task_worker(metric, args):
+    return _run_task(_worker_graph, _worker_binary, metric, args)
+
+
+def centralities(W, mode="approximate", k=DEFAULT_PIVOTS, seed=0, workers=1, metrics=METRICS,
+                 chunk_size=None):
+    """
+    Betweenness, eigenvector and closeness centrality of every node of W.
+    "exact" uses every node as a source; "approximate" samples k pivot sources
+    for betweenness and closeness. Eigenvector centrality is always exact.
+
+    Betweenness and the closeness of each connected component run as chunks of
+    source nodes (chunk_size sources each, by default four chunks per worker);
+    with workers > 1 the tasks of all metrics share one process pool and the
+    partial results are merged afterwards.
+    Returns (values, timings): values maps each metric to an array over the nodes,
+    timings maps each metric to the seconds its tasks ran (summed over workers)
+    and "Total" to the elapsed time.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown centrality mode: {mode}")
+    started = time.perf_counter()
+    k = None if mode == "exact" else k
+    B = _binary(W)
+    n = B.shape[0]
+
+    if chunk_size is None and workers > 1:
+        chunk_size = max(DEFAULT_BATCH_SIZE, -(-min(n, k or n) // (4 * workers)))
+
+    tasks = []
+    if "Betweenness" in metrics:
+        sources = _sample(n, k, seed)
+        tasks.extend(("Betweenness", (chunk,)) for chunk in _chunks(sources, chunk_size or max(len(sources), 1)))
+    if "Eigenvector" in metrics:
+        tasks.append(("Eigenvector", ()))
+    components = _components(B) if "Closeness" in metrics else []
+    sampled = [_sample(len(component), k, seed) for component in components]
+    for component, positions in zip(components, sampled):
+        tasks.extend(("Closeness", (component, chunk)) for chunk in _chunks(positions, chunk_size or len(positions)))
+
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(W,)) as executor:
+            results = list(executor.map(_run_task_worker, *zip(*tasks)))
+    else:
+        results = [_run_task(W, B, metric, args) for metric, args in tasks]
+
+    timings = {metric: 0.0 for metric in metrics}
+    betweenness = np.zeros(n)
+    farness = np.zeros(n)
+    values = {}
+    for (metric, args), (result, seconds) in zip(tasks, results):
+        timings[metric] += seconds
+        if metric == "Betweenness":
+            betweenness += result
+        elif metric == "Eigenvector":
+            values[metric] = result
+        else:
+            farness[args[0]] += result
+
+    closeness = np.zeros(n)
+    for component, positions in zip(components, sampled):
+        # Wasserman-Faust scaling of networkx, farness extrapolated from the sampled sources
+        r = len(component)
+        total = farness[component] * r / len(positions)
+        closeness[component] = (r - 1) / total * (r - 1) / (n - 1)
+
+    if "Betweenness" in metrics:
+        if n > 2:
+            betweenness *= (n / len(sources)) / ((n - 1) * (n - 2))
+        values["Betweenness"] = betweenness
+    if "Closeness" in metrics:
+        values["Closeness"] = closeness
+    timings["Total"] = time.perf_counter() - started
+    return {metric: values[metric] for metric in metrics}, timings
+
+
+def betweenness_centrality(W, k=None, seed=0, workers=1):
+    """
+    Normalized betweenness (Brandes) on hop distances, from batches of sources at once.
+    With k, only k randomly sampled pivot sources are used and the result is
+    extrapolated, as in networkx's betweenness_centrality(k=...).
+    """
+    return centralities(W, "exact" if k is None else "approximate", k, seed, workers, ("Betweenness",))[0]["Betweenness"]
+
+
+def closeness_centrality(W, k=None, seed=0, workers=1):
+    """
+    Closeness on hop distances, computed per connected component with the
+    Wasserman-Faust scaling of networkx ((r - 1) / (n - 1) for a component of r nodes).
+    With k, the distances within components larger than k are estimated from
+    k sampled pivot sources and scaled by r / k.
+    """
+    return centralities(W, "exact" if k is None else "approximate", k, seed, workers, ("Closeness",))[0]["Closeness"]
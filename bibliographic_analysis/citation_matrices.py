@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def build_incidence(reference_lists):
+    """
+    Intern references to integer ids and build the article x reference incidence matrix.
+    Returns (A, labels): A is a 0/1 CSR matrix with one row per reference list and
+    labels[i] is the reference of column i. Ids follow the sorted order of the labels.
+    """
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    for refs in reference_lists:
+        indices.extend({vocabulary.setdefault(ref, len(vocabulary)) for ref in refs})
+        indptr.append(len(indices))
+
+    labels = np.array(list(vocabulary), dtype=object)
+    order = np.argsort(labels, kind="stable")
+    rank = np.empty(len(labels), dtype=np.int64)
+    rank[order] = np.arange(len(labels))
+
+    A = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), rank[np.asarray(indices, dtype=np.int64)], indptr),
+        shape=(len(indptr) - 1, len(labels)),
+    )
+    A.sort_indices()
+    return A, labels[order]
+
+
+def co_citation_matrix(A):
+    """Upper triangle of AᵀA: entry (i, j) counts the articles citing both reference i and j."""
+    return sparse.triu(A.T.tocsr() @ A, k=1).tocoo()
+
+
+def top_pairs(M, labels, k=None, columns=('Ref1', 'Ref2', 'Count')):
+    """
+    Return the k largest entries of a sparse pair matrix as a DataFrame of
+    (label, label, value), sorted by value. Only the k rows are built.
+    """
+    M = M.tocoo()
+    data = M.data
+    if k is not None and k < len(data):
+        selected = np.argpartition(-data, k - 1)[:k]
+    else:
+        selected = np.arange(len(data))
+    selected = selected[np.argsort(-data[selected], kind="stable")]
+
+    return pd.DataFrame({
+        columns[0]: labels[M.row[selected]],
+        columns[1]: labels[M.col[selected]],
+        columns[2]: data[selected],
+    })
+
+
+NORMALIZATIONS = (None, "cosine", "jaccard")
+
+# Matrix and row sizes shared with the coupling worker processes, set once per worker
+_worker_matrix = None
+_worker_sizes = None
+
+
+def coupling_strength(rows, cols, shared, sizes, normalization=None):
+    """Coupling strength of article pairs (rows[i], cols[i]) sharing shared[i] references, given each article's reference count."""
+    if normalization is None:
+        return shared
+    if normalization == "cosine":
+        return shared / np.sqrt(sizes[rows] * sizes[cols])
+    return shared / (sizes[rows] + sizes[cols] - shared)
+
+
+def _coupling_block(A, sizes, start, stop, normalization=None, min_strength=None):
+    """Coupling of rows start..stop with every later row, as COO arrays (row, col, value)."""
+    block = (A[start:stop] @ A.T).tocoo()
+    rows = block.row + start
+    keep = block.col > rows
+    rows, cols, shared = rows[keep], block.col[keep], block.data[keep]
+
+    values = coupling_strength(rows, cols, shared, sizes, normalization)
+    if min_strength is not None:
+        keep = values >= min_strength
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+    return rows, cols, values
+
+
+def _init_coupling_worker(A, sizes):
+    global _worker_matrix, _worker_sizes
+    _worker_matrix = A
+    _worker_sizes = sizes
+
+
+def _coupling_block_worker(start, stop, normalization, min_strength):
+    return _coupling_block(_worker_matrix, _worker_sizes, start, stop, normalization, min_strength)
+
+
+def coupling_matrix(A, normalization=None, min_strength=None, block_size=2000, workers=1):
+    """
+    Bibliographic coupling as the upper triangle of AAᵀ: entry (i, j) is the number
+    of references shared by articles i and j, or its cosine / Jaccard normalization.
+    Rows are processed in blocks (across `workers` processes when > 1) and entries
+    below min_strength are dropped per block, so the full product is never held.
+    """
+    if normalization not in NORMALIZATIONS:
+        raise ValueError(f"Unknown normalization: {normalization}")
+    A = sparse.csr_matrix(A, dtype=np.float64 if normalization else A.dtype)
+    n = A.shape[0]
+    sizes = np.asarray(A.sum(axis=1)).ravel()
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    if workers > 1 and len(blocks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_coupling_worker, initargs=(A, sizes)) as executor:
+            parts = list(executor.map(_coupling_block_worker, *zip(*[(start, stop, normalization, min_strength)
+                                                                      for start, stop in blocks])))
+    else:
+        parts = [_coupling_block(A, sizes, start, stop, normalization, min_strength) for start, stop in blocks]
+
+    rows = np.concatenate([part[0] for part in parts]) if parts else np.array([], dtype=np.int64)
+    cols = np.concatenate([part[1] for part in parts]) if parts else np.array([], dtype=np.int64)
+    values = np.concatenate([part[2] for part in parts]) if parts else np.array([], dtype=A.dtype)
+    return sparse.coo_matrix((values, (rows, cols)), shape=(n, n))
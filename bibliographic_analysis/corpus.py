@@ -0,0 +1,37 @@
+import io
+import os
+
+import pandas as pd
+
+CORPUS_TYPES = ["parquet", "arrow", "feather", "xlsx", "csv"]
+
+
+def load_corpus(source, memory_map=True):
+    """
+    Load a corpus from a path or an uploaded file.
+    Parquet and Arrow IPC files are the canonical format written by
+    data_preparation (to_corpus); Excel and csv are still read for imports.
+    Paths to parquet/arrow files are memory-mapped instead of copied into memory.
+    """
+    name = source if isinstance(source, str) else source.name
+    extension = os.path.splitext(name)[1].lower()
+
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        if isinstance(source, str):
+            table = pq.read_table(source, memory_map=memory_map)
+        else:
+            table = pq.read_table(io.BytesIO(source.getvalue()))
+        return table.to_pandas()
+    if extension in (".arrow", ".feather"):
+        import pyarrow.feather as feather
+
+        if isinstance(source, str):
+            table = feather.read_table(source, memory_map=memory_map)
+        else:
+            table = feather.read_table(io.BytesIO(source.getvalue()))
+        return table.to_pandas()
+    if extension == ".csv":
+        return pd.read_csv(source)
+    return pd.read_excel(source)
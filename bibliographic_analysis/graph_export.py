@@ -0,0 +1,114 @@
+import numpy as np
+from pyvis.network import Network
+
+DEFAULT_COLOR = "#97c2fc"
+# add_nodes and add_edges write the Network internals (nodes, node_ids, node_map,
+# edges) as this pyvis version's add_node / add_edge do; test_graph_export.py
+# compares them and must pass again before pyvis is upgraded
+PYVIS_VERSION = "0.3.2"
+
+
+def _column(value, n):
+    """One value per node: a scalar repeated, or a sequence / array as Python values."""
+    if isinstance(value, str) or np.ndim(value) == 0:
+        return [value] * n
+    values = value.tolist() if isinstance(value, np.ndarray) else list(value)
+    if len(values) != n:
+        raise ValueError(f"{len(values)} values for {n} nodes")
+    return values
+
+
+def _python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def add_nodes(net, nodes, shape="dot", color=DEFAULT_COLOR, **attributes):
+    """
+    Add nodes to a pyvis Network in one pass, with the options Network.add_node
+    would give them. Every attribute (label, size, color, borderWidth, title,
+    x, y...) is one value for all nodes or a sequence aligned with nodes.
+    Nodes already in the network are skipped; as in add_node, a group's style
+    replaces the color.
+    """
+    ids = [_python(node) for node in nodes]
+    columns = {key: _column(value, len(ids)) for key, value in attributes.items()}
+    if "group" not in columns:
+        columns["color"] = _column(color, len(ids))
+    labels = columns.pop("label", ids)
+    for i, node in enumerate(ids):
+        if node in net.node_map:
+            continue
+        options = {key: values[i] for key, values in columns.items()}
+        options.update(id=node, label=labels[i] if labels[i] else node, shape=shape)
+        if net.font_color:
+            options["font"] = dict(color=net.font_color)
+        net.nodes.append(options)
+        net.node_ids.append(node)
+        net.node_map[node] = options
+
+
+def add_edges(net, sources, targets, **attributes):
+    """
+    Add edges between existing nodes in one pass, attributes as in add_nodes.
+    On undirected networks a pair that is already connected is skipped, as in Network.add_edge.
+    """
+    sources, targets = [_python(node) for node in sources], [_python(node) for node in targets]
+    columns = {key: _column(value, len(sources)) for key, value in attributes.items()}
+    seen = {frozenset((edge['from'], edge['to'])) for edge in net.edges} if not net.directed else set()
+    for i, (source, target) in enumerate(zip(sources, targets)):
+        for node in (source, target):
+            if node not in net.node_map:
+                raise ValueError(f"non existent node '{node}'")
+        if not net.directed:
+            pair = frozenset((source, target))
+            if pair in seen:
+                continue
+            seen.add(pair)
+        options = {key: values[i] for key, values in columns.items()}
+        options.update({'from': source, 'to': target})
+        if net.directed:
+            options.setdefault("arrows", "to")
+        net.edges.append(options)
+
+
+def centrality_attributes(nodes, betweenness, eigenvector, closeness, metric):
+    """
+    Size, color, border and tooltip of every node, aligned with nodes: sized by
+    metric, the top 10 by betweenness red, by eigenvector blue and by closeness
+    green (in that order of precedence), with a thick border.
+    """
+    nodes = list(nodes)
+    values = {name: np.array([scores[node] for node in nodes], dtype=float)
+              for name, scores in (("Betweenness", betweenness), ("Eigenvector", eigenvector), ("Closeness", closeness))}
+    top10 = {}
+    for name, scores in values.items():
+        top10[name] = np.zeros(len(nodes), dtype=bool)
+        top10[name][np.argsort(-scores, kind="stable")[:10]] = True
+    highlighted = top10["Betweenness"] | top10["Eigenvector"] | top10["Closeness"]
+    return {
+        "size": 15 + values[metric]*50,
+        "color": np.select([top10["Betweenness"], top10["Eigenvector"], top10["Closeness"]],
+                           ["red", "blue", "green"], "lightgray"),
+        "borderWidth": np.where(highlighted, 5, 1),
+        "title": [f"Betweenness: {b:.4f}\nEigenvector: {e:.4f}\nCloseness: {c:.4f}"
+                  for b, e, c in zip(values["Betweenness"], values["Eigenvector"], values["Closeness"])],
+    }
+
+
+def static_network(G, nodes, positions, height="600px", **attributes):
+    """
+    pyvis Network of the given nodes of G (attributes aligned with nodes, as in
+    add_nodes) at fixed positions {node: (x, y)} without physics, with the
+    weighted edges of G between them.
+    """
+    net = Network(height=height, width="100%", notebook=False, bgcolor="#ffffff", font_color="black",
+                  cdn_resources="remote")
+    net.toggle_physics(False)
+    nodes = list(nodes)
+    add_nodes(net, nodes, x=[positions[node][0] for node in nodes], y=[positions[node][1] for node in nodes],
+              physics=False, **attributes)
+    shown = set(nodes)
+    edges = [(u, v, weight) for u, v, weight in G.edges(data="weight") if u in shown and v in shown]
+    sources, targets, weights = zip(*edges) if edges else ((), (), ())
+    add_edges(net, sources, targets, value=weights)
+    return net
@@ -0,0 +1,341 @@
+import json
+from string import Template
+
+import numpy as np
+from scipy import sparse
+
+from graph_render import vis_assets
+
+DEFAULT_ITERATIONS = 50
+NODE_SPACING = 20
+EXACT_REPULSION = 300
+GRID_CELLS = 16
+EDGES_PER_NODE = 5
+EXPANDED_BELOW = 500
+LABEL_LENGTH = 40
+GRAVITY = 1.0
+
+
+# --- Force-directed layout ---
+
+def _repulsion(positions, k, chunk=1000):
+    """
+    Fruchterman-Reingold repulsion k² / d on every node. Exact below EXACT_REPULSION
+    nodes; above, every node is repelled by the centroids of a GRID_CELLS² grid,
+    weighted by the nodes in each cell.
+    """
+    n = len(positions)
+    if n <= EXACT_REPULSION:
+        sources, masses, floor = positions, np.ones(n), 1e-4
+    else:
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        size = np.maximum(high - low, 1e-9) / GRID_CELLS
+        cells = np.minimum(((positions - low) / size).astype(np.int64), GRID_CELLS - 1)
+        cell = cells[:, 0] * GRID_CELLS + cells[:, 1]
+        masses = np.bincount(cell, minlength=GRID_CELLS ** 2)
+        occupied = np.flatnonzero(masses)
+        sources = np.column_stack([np.bincount(cell, weights=positions[:, axis], minlength=GRID_CELLS ** 2)[occupied]
+                                   for axis in range(2)]) / masses[occupied, None]
+        masses, floor = masses[occupied], (size ** 2).sum() / 4
+
+    displacement = np.zeros_like(positions)
+    for start in range(0, n, chunk):
+        dx = positions[start:start + chunk, 0, None] - sources[None, :, 0]
+        dy = positions[start:start + chunk, 1, None] - sources[None, :, 1]
+        force = masses * k ** 2 / np.maximum(dx * dx + dy * dy, floor)
+        displacement[start:start + chunk, 0] = (dx * force).sum(axis=1)
+        displacement[start:start + chunk, 1] = (dy * force).sum(axis=1)
+    return displacement
+
+
+def force_layout(W, positions=None, iterations=DEFAULT_ITERATIONS, seed=0, gravity=GRAVITY):
+    """
+    Fruchterman-Reingold layout of the weighted sparse adjacency W in the unit
+    square: attraction along the edges (weights scaled to at most 1), repulsion
+    between nodes and a constant pull towards the centre that keeps disconnected
+    parts from drifting to the border, with a linearly cooling step.
+    Returns (n, 2) positions.
+    """
+    W = sparse.coo_matrix(W)
+    n = W.shape[0]
+    upper = W.row < W.col
+    rows, cols, weights = W.row[upper], W.col[upper], W.data[upper].astype(np.float64)
+    weights = weights / weights.max() if len(weights) else weights
+    positions = np.random.default_rng(seed).random((n, 2)) if positions is None else positions.astype(np.float64)
+    if n < 2:
+        return positions
+
+    k = np.sqrt(1.0 / n)
+    temperature = 0.1
+    for _ in range(iterations):
+        displacement = _repulsion(positions, k)
+        offset = positions - positions.mean(axis=0)
+        displacement -= gravity * offset / np.maximum(np.sqrt((offset ** 2).sum(axis=1)), 1e-9)[:, None]
+        delta = positions[rows] - positions[cols]
+        distance = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+        pull = delta * (distance * weights / k)[:, None]
+        for axis in range(2):
+            displacement[:, axis] += (np.bincount(cols, weights=pull[:, axis], minlength=n)
+                                      - np.bincount(rows, weights=pull[:, axis], minlength=n))
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 0.01)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= 0.1 / (iterations + 1)
+    return positions
+
+
+def _unit_disc(positions):
+    centred = positions - positions.mean(axis=0)
+    radius = np.sqrt((centred ** 2).sum(axis=1)).max()
+    return centred / radius if radius > 0 else centred
+
+
+def _separate(centres, radii, iterations=50):
+    """Push apart overlapping circles (centres, radii) until they no longer overlap or iterations run out."""
+    for _ in range(iterations):
+        delta = centres[:, None, :] - centres[None, :, :]
+        distance = np.maximum(np.sqrt((delta ** 2).sum(axis=2)), 1e-9)
+        overlap = np.maximum(radii[:, None] + radii[None, :] - distance, 0)
+        np.fill_diagonal(overlap, 0)
+        if not overlap.any():
+            break
+        centres = centres + (delta / distance[:, :, None] * overlap[:, :, None] / 2).sum(axis=1)
+    return centres
+
+
+def cluster_layout(W, communities, iterations=DEFAULT_ITERATIONS, seed=0, per_node=2 * EDGES_PER_NODE):
+    """
+    Two-level layout of W: the graph of the communities (edge weights summed) is
+    laid out first, each community gets a disc whose area grows with its size,
+    and the nodes of each community are laid out inside its disc, pulled only
+    by the per_node strongest edges of each node.
+    Returns (node positions, community centres), both in pixels.
+    """
+    n_clusters = communities.max() + 1
+    P = sparse.csr_matrix((np.ones(len(communities)), (np.arange(len(communities)), communities)),
+                          shape=(len(communities), n_clusters))
+    C = (P.T @ sparse.csr_matrix(W) @ P).tolil()
+    C.setdiag(0)
+    counts = np.bincount(communities, minlength=n_clusters)
+    radii = NODE_SPACING * np.sqrt(counts)
+
+    # --- Community centres, scaled so that neighbouring discs about touch, then separated ---
+    centres = force_layout(C.tocsr(), iterations=iterations, seed=seed) if n_clusters > 1 else np.zeros((1, 2))
+    if n_clusters > 1:
+        delta = np.sqrt(((centres[:, None, :] - centres[None, :, :]) ** 2).sum(axis=2))
+        np.fill_diagonal(delta, np.inf)
+        nearest = delta.argmin(axis=1)
+        centres = centres * np.median((radii + radii[nearest]) / np.maximum(delta.min(axis=1), 1e-9))
+        centres = _separate(centres, radii)
+
+    # --- Nodes inside their community's disc ---
+    positions = np.zeros((len(communities), 2))
+    order = np.argsort(communities, kind="stable")
+    W = backbone(W, per_node)
+    for cluster, members in enumerate(np.split(order, np.cumsum(counts)[:-1])):
+        if len(members) == 1:
+            local = np.zeros((1, 2))
+        elif len(members) <= 3:
+            angles = 2 * np.pi * np.arange(len(members)) / len(members)
+            local = np.column_stack([np.cos(angles), np.sin(angles)]) * 0.5
+        else:
+            local = _unit_disc(force_layout(W[members][:, members], iterations=iterations, seed=seed))
+        positions[members] = centres[cluster] + local * radii[cluster]
+    return positions, centres
+
+
+def graph_positions(G, iterations=DEFAULT_ITERATIONS, seed=0):
+    """{node: (x, y)} pixel positions of a networkx graph, laid out once so the browser needs no physics."""
+    import networkx as nx
+
+    if G.number_of_nodes() == 0:
+        return {}
+    W = nx.to_scipy_sparse_array(G, weight="weight", format="csr")
+    positions = _unit_disc(force_layout(W, iterations=iterations, seed=seed)) * NODE_SPACING * np.sqrt(len(G)) * 1.5
+    return {node: (float(x), float(y)) for node, (x, y) in zip(G.nodes(), positions)}
+
+
+# --- Level-of-detail export ---
+
+def _first_per_key(keys, weights, count):
+    """Positions of the count largest weights of every key."""
+    order = np.lexsort((-weights, keys))
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])[:len(order)]
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    return order[rank < count]
+
+
+def strongest_edges(W, per_node=EDGES_PER_NODE):
+    """Undirected edges (rows, cols, weights), rows < cols, that are among the per_node strongest of either endpoint."""
+    W = sparse.csr_matrix(W)
+    rows = np.repeat(np.arange(W.shape[0]), np.diff(W.indptr))
+    keep = _first_per_key(rows, W.data, per_node)
+    pairs = np.unique(np.sort(np.column_stack([rows[keep], W.indices[keep]]), axis=1), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return pairs[:, 0], pairs[:, 1], np.asarray(W[pairs[:, 0], pairs[:, 1]]).ravel()
+
+
+def backbone(W, per_node=EDGES_PER_NODE):
+    """Symmetric CSR adjacency of the strongest_edges of W."""
+    rows, cols, weights = strongest_edges(W, per_node)
+    return sparse.csr_matrix((np.concatenate([weights, weights]), (np.concatenate([rows, cols]),
+                                                                   np.concatenate([cols, rows]))), shape=W.shape)
+
+
+def node_cluster_edges(W, communities, per_node=EDGES_PER_NODE):
+    """
+    Summed weight of every node's edges into each other community, as (nodes,
+    communities, weights): the per_node strongest of each node, plus the
+    strongest node on either side of every pair of linked communities.
+    """
+    P = sparse.csr_matrix((np.ones(len(communities)), (np.arange(len(communities)), communities)))
+    Q = (sparse.csr_matrix(W) @ P).tocoo()
+    other = communities[Q.row] != Q.col
+    nodes, targets, weights = Q.row[other], Q.col[other], Q.data[other]
+    keep = np.zeros(len(nodes), dtype=bool)
+    keep[_first_per_key(nodes, weights, per_node)] = True
+    keep[_first_per_key(communities[nodes].astype(np.int64) * (communities.max() + 1) + targets, weights, 1)] = True
+    return nodes[keep], targets[keep], weights[keep]
+
+
+def lod_graph(W, labels, communities, iterations=DEFAULT_ITERATIONS, seed=0, per_node=EDGES_PER_NODE):
+    """
+    Level-of-detail graph of W with fixed positions, as a JSON-serializable dict:
+    "clusters" are the super-nodes of the communities with their summed "cluster_edges";
+    "nodes" are the individual nodes (group = community) with the per_node
+    strongest "edges" of each node, shown when their community is expanded, and
+    "node_cluster_edges" link an expanded node to the collapsed communities it is tied to.
+    """
+    positions, centres = cluster_layout(W, communities, iterations, seed)
+    counts = np.bincount(communities)
+    degrees = np.asarray(sparse.csr_matrix(W).sum(axis=1)).ravel()
+    sizes = 5 + 20 * np.sqrt(degrees / max(degrees.max(), 1))
+
+    P = sparse.csr_matrix((np.ones(len(communities)), (np.arange(len(communities)), communities)))
+    C = sparse.triu(P.T @ sparse.csr_matrix(W) @ P, k=1).tocoo()
+    rows, cols, weights = strongest_edges(W, per_node)
+    tied_nodes, tied_clusters, tied_weights = node_cluster_edges(W, communities, per_node)
+    return {
+        "clusters": [{"id": f"cluster-{c}", "group": int(c), "label": f"Cluster {c + 1} ({counts[c]})",
+                      "x": float(x), "y": float(y), "size": float(10 + 3 * np.sqrt(counts[c]))}
+                     for c, (x, y) in enumerate(centres)],
+        "cluster_edges": [{"id": f"c{i}", "from": f"cluster-{a}", "to": f"cluster-{b}", "value": float(w)}
+                          for i, (a, b, w) in enumerate(zip(C.row, C.col, C.data))],
+        "nodes": [{"id": int(i), "group": int(c), "label": str(label)[:LABEL_LENGTH], "title": str(label),
+                   "x": float(x), "y": float(y), "size": float(size)}
+                  for i, (label, c, (x, y), size) in enumerate(zip(labels, communities, positions, sizes))],
+        "edges": [{"id": f"e{i}", "from": int(a), "to": int(b), "value": float(w)}
+                  for i, (a, b, w) in enumerate(zip(rows, cols, weights))],
+        "node_cluster_edges": [{"id": f"n{i}", "from": int(a), "to": f"cluster-{c}", "value": float(w)}
+                               for i, (a, c, w) in enumerate(zip(tied_nodes, tied_clusters, tied_weights))],
+    }
+
+
+
+def with_node_sizes(graph, scores):
+    """
+    Copy of a lod_graph with its nodes sized by scores (aligned with graph["nodes"],
+    e.g. a centrality of the same graph) instead of by weighted degree.
+    """
+    scores = np.asarray(scores, dtype=float)
+    top = scores.max() if len(scores) else 0
+    sizes = 5 + 20 * np.sqrt(scores / top) if top > 0 else np.full(len(scores), 5.0)
+    return dict(graph, nodes=[dict(node, size=float(size)) for node, size in zip(graph["nodes"], sizes)])
+
+
+LOD_TEMPLATE = Template("""<html>
+<head>
+<meta charset="utf-8">
+$vis_assets
+<style>
+body { margin: 0; font-family: sans-serif; font-size: 13px; }
+#graph { width: 100%; height: $height; border: 1px solid lightgray; }
+</style>
+</head>
+<body>
+<div>
+<button onclick="expandAll()">Expand all</button>
+<button onclick="collapseAll()">Collapse all</button>
+Double-click a cluster to expand it and a node to collapse its cluster.
+</div>
+<div id="graph"></div>
+<script type="text/javascript">
+var graph = $graph;
+var nodes = new vis.DataSet(), edges = new vis.DataSet();
+var clusters = {}, members = {}, memberEdges = {}, clusterEdges = {}, tiesFrom = {}, tiesTo = {}, expanded = {};
+graph.clusters.forEach(function (c) {
+    clusters[c.group] = c; members[c.group] = []; memberEdges[c.group] = []; clusterEdges[c.group] = [];
+    tiesFrom[c.group] = []; tiesTo[c.group] = [];
+});
+var groupOf = {};
+graph.nodes.forEach(function (n) { groupOf[n.id] = n.group; members[n.group].push(n); });
+graph.edges.forEach(function (e) {
+    memberEdges[groupOf[e.from]].push(e);
+    if (groupOf[e.to] !== groupOf[e.from]) memberEdges[groupOf[e.to]].push(e);
+});
+graph.cluster_edges.forEach(function (e) {
+    clusterEdges[clusters[e.from.slice(8)].group].push(e);
+    clusterEdges[clusters[e.to.slice(8)].group].push(e);
+});
+// Node-to-cluster edges, shown while the node's cluster is expanded and the other one collapsed
+graph.node_cluster_edges.forEach(function (e) {
+    tiesFrom[groupOf[e.from]].push(e);
+    tiesTo[clusters[e.to.slice(8)].group].push(e);
+});
+
+function visible(e) {
+    return expanded[groupOf[e.from]] && expanded[groupOf[e.to]];
+}
+function collapsedEnds(e) {
+    return !expanded[e.from.slice(8)] && !expanded[e.to.slice(8)];
+}
+function tied(e) {
+    return expanded[groupOf[e.from]] && !expanded[e.to.slice(8)];
+}
+function ids(items) {
+    return items.map(function (item) { return item.id; });
+}
+function expand(group) {
+    if (expanded[group]) return;
+    expanded[group] = true;
+    edges.remove(ids(clusterEdges[group]).concat(ids(tiesTo[group])));
+    nodes.remove(clusters[group].id);
+    nodes.add(members[group]);
+    edges.update(memberEdges[group].filter(visible).concat(tiesFrom[group].filter(tied)));
+}
+function collapse(group) {
+    if (!expanded[group]) return;
+    expanded[group] = false;
+    edges.remove(ids(memberEdges[group]).concat(ids(tiesFrom[group])));
+    nodes.remove(ids(members[group]));
+    nodes.add(clusters[group]);
+    edges.update(clusterEdges[group].filter(collapsedEnds).concat(tiesTo[group].filter(tied)));
+}
+function expandAll() { graph.clusters.forEach(function (c) { expand(c.group); }); }
+function collapseAll() { graph.clusters.forEach(function (c) { collapse(c.group); }); }
+
+nodes.add(graph.clusters);
+edges.add(graph.cluster_edges);
+var network = new vis.Network(document.getElementById("graph"), {nodes: nodes, edges: edges}, {
+    physics: false,
+    nodes: {shape: "dot", font: {size: 12}},
+    edges: {smooth: false, color: {opacity: 0.4}, scaling: {min: 1, max: 8}},
+    interaction: {hideEdgesOnDrag: true, tooltipDelay: 100}
+});
+network.on("doubleClick", function (params) {
+    if (params.nodes.length === 0) return;
+    var id = params.nodes[0];
+    if (typeof id === "string") expand(clusters[id.slice(8)].group);
+    else collapse(groupOf[id]);
+});
+if (graph.nodes.length <= $expanded_below) expandAll();
+</script>
+</body>
+</html>
+""")
+
+
+def lod_html(graph, height="750px"):
+    """Standalone HTML page of a lod_graph: fixed positions, no physics, clusters expand on double-click."""
+    return LOD_TEMPLATE.substitute(graph=json.dumps(graph).replace("</", "<\\/"), height=height,
+                                   vis_assets=vis_assets(), expanded_below=EXPANDED_BELOW)
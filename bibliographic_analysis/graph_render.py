@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+VIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib", "vis-9.1.2")
+CACHE_SIZE = 64
+
+# vis-network tags of pyvis's "remote" template, replaced by the vendored files
+CDN_TAGS = re.compile(r'<link rel="stylesheet" href="https://cdnjs[^"]*/vis-network[^"]*"[^>]*>'
+                      r'|<script src="https://cdnjs[^"]*/vis-network[^"]*"[^>]*></script>')
+
+_rendered = OrderedDict()
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def vis_assets():
+    """<style> and <script> tags of the vendored vis-network 9.1.2, read once per process."""
+    with open(os.path.join(VIS_DIR, "vis-network.css"), encoding="utf-8") as f:
+        css = f.read()
+    with open(os.path.join(VIS_DIR, "vis-network.min.js"), encoding="utf-8") as f:
+        js = f.read()
+    return f"<style>{css}</style>\n<script>{js}</script>"
+
+
+def graph_hash(net):
+    """Hash of everything a pyvis Network renders: nodes, edges, size and options."""
+    data = json.dumps([net.get_network_data(), net.bgcolor], sort_keys=True, default=str)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def render_html(net):
+    """
+    Standalone HTML of a pyvis Network, built in memory with vis-network
+    inlined, so it needs neither a file nor the CDN. Pages are cached by
+    graph_hash: the same graph in any session is rendered once.
+    """
+    key = graph_hash(net)
+    with _lock:
+        if key in _rendered:
+            _rendered.move_to_end(key)
+            return _rendered[key]
+
+    net.cdn_resources = "remote"
+    assets = vis_assets()
+    html = CDN_TAGS.sub("", net.generate_html(notebook=False), count=2).replace("<head>", "<head>\n" + assets, 1)
+
+    with _lock:
+        _rendered[key] = html
+        while len(_rendered) > CACHE_SIZE:
+            _rendered.popitem(last=False)
+    return html
@@ -0,0 +1,247 @@
+# Incremental analysis state: appending or changing records applies deltas
+# to persisted counts instead of recomputing the whole corpus.
+# Usage: python incremental.py <corpus file>
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from author_metrics import author_indicators
+from author_table import build_author_table
+from citation_matrices import coupling_matrix, coupling_strength
+from corpus import load_corpus
+from indicators import article_indicators
+from reference_index import ReferenceIndex
+from reference_matching import deduplicate_new_references, deduplicate_references
+
+STATE_SUFFIX = ".state"
+# Deltas above this fraction of the state's records are applied by a full rebuild
+MAX_UPDATE_FRACTION = 0.25
+TRACKED_COLUMNS = ['DOI', 'Title', 'Authors', 'Author Address', 'Source', 'Publication year', 'Times Cited', 'Article References']
+
+
+def record_keys(df):
+    """
+    Key of every record: "doi:<doi>", else "title:<title>" (case-folded), numbered
+    when repeated so that every record of the corpus has its own key.
+    """
+    keys = pd.Series([f"row:{i}" for i in range(len(df))], index=df.index, dtype=object)
+    for column, prefix in (('Title', "title"), ('DOI', "doi")):
+        if column in df.columns:
+            values = df[column].astype("string").str.strip().str.casefold()
+            present = values.notna() & (values != "")
+            keys[present] = prefix + ":" + values[present].astype(object)
+    occurrence = keys.groupby(keys).cumcount()
+    return (keys + np.where(occurrence > 0, "#" + occurrence.astype(str), "")).to_numpy(dtype=object)
+
+
+def record_fingerprints(df):
+    """Hash of the tracked columns of every record; a changed hash marks a changed record."""
+    columns = [column for column in TRACKED_COLUMNS if column in df.columns]
+    return pd.util.hash_pandas_object(df[columns].astype("string"), index=False).to_numpy()
+
+
+def diff_records(keys, fingerprints, new_keys, new_fingerprints):
+    """
+    Compare the records of a state with those of a new corpus version.
+    Returns (removed, added): positions in the state of records that are gone or
+    changed, and positions in the new corpus of records that are new or changed.
+    """
+    old = dict(zip(keys, fingerprints))
+    unchanged = np.array([old.get(key) == fingerprint for key, fingerprint in zip(new_keys, new_fingerprints)],
+                         dtype=bool)
+    kept = set(np.asarray(new_keys, dtype=object)[unchanged])
+    removed = np.flatnonzero(np.array([key not in kept for key in keys], dtype=bool))
+    return removed, np.flatnonzero(~unchanged)
+
+
+def upper_triangle_product(X, Y):
+    """Upper triangle (k=1) of XᵀY as CSR."""
+    return sparse.triu(X.T.tocsr() @ Y, k=1).tocsr()
+
+
+class CorpusState:
+    """
+    Everything the analyses count, for the records of a corpus in state order:
+    their keys and fingerprints, the columns the indicators read, the reference
+    index, the co-citation counts (reference x reference, upper triangle), the raw
+    coupling counts (record x record, upper triangle), the author table and the
+    author / source / year indicator tables.
+    """
+
+    def __init__(self, records, index, co_citation, coupling, authors, tables):
+        self.records = records
+        self.index = index
+        self.co_citation = co_citation
+        self.coupling = coupling
+        self.authors = authors
+        self.tables = tables
+
+    @classmethod
+    def build(cls, df):
+        records = cls._records(df)
+        index = ReferenceIndex.build(records['Article References'])
+        deduplicate_references(index)
+        A = index.incidence()
+        authors = build_author_table(records)
+        tables = {
+            "Authors": author_indicators(records, authors, current_year=records['Publication year'].max()),
+            "Sources": article_indicators(records, 'Source'),
+            "Publication Years": article_indicators(records, 'Publication year'),
+        }
+        return cls(records, index, upper_triangle_product(A, A), coupling_matrix(A).tocsr(), authors, tables)
+
+    @staticmethod
+    def _records(df):
+        records = df[[column for column in TRACKED_COLUMNS if column in df.columns]].reset_index(drop=True)
+        for column in TRACKED_COLUMNS:
+            if column not in records.columns:
+                records[column] = np.nan
+        return records.assign(key=record_keys(df), fingerprint=record_fingerprints(df))
+
+    def coupling_matrix(self, normalization=None):
+        """Coupling of the state records, raw or cosine / Jaccard normalized, as COO."""
+        C = self.coupling.tocoo()
+        sizes = self.index.row_sizes.astype(np.float64)
+        values = coupling_strength(C.row, C.col, C.data.astype(np.float64 if normalization else C.dtype), sizes,
+                                   normalization)
+        return sparse.coo_matrix((values, (C.row, C.col)), shape=C.shape)
+
+    def update(self, df):
+        """
+        Apply the difference between the state and a new version of the corpus.
+        Removed and changed records are subtracted, new and changed records are
+        added; indicator rows are recomputed only for the authors, sources and
+        years those records touch. New references are deduplicated against the
+        known ones (deduplicate_new_references). The state is rebuilt from df
+        instead when the delta exceeds MAX_UPDATE_FRACTION of the records or
+        when new references would merge known references of different clusters.
+        Returns {"removed": n, "added": n, "rebuilt": bool}.
+        """
+        new_records = self._records(df)
+        removed, added = diff_records(self.records['key'].to_numpy(), self.records['fingerprint'].to_numpy(),
+                                      new_records['key'].to_numpy(), new_records['fingerprint'].to_numpy())
+        if len(removed) == 0 and len(added) == 0:
+            return {"removed": 0, "added": 0, "rebuilt": False}
+        if len(removed) + len(added) > MAX_UPDATE_FRACTION * len(self.records):
+            return self._rebuild(df, removed, added)
+        kept = np.setdiff1d(np.arange(len(self.records)), removed)
+        previous_year = self.records['Publication year'].max()
+        delta_records = new_records.iloc[added].reset_index(drop=True)
+        touched = pd.concat([self.records.iloc[removed], delta_records])
+
+        # --- Co-citation: subtract the removed rows' pairs, add the new rows' pairs ---
+        old_A = self.index.incidence(removed)
+        first_new = len(self.index.keys)
+        self.index = self.index.select(kept).extend(delta_records['Article References'])
+        if not deduplicate_new_references(self.index, first_new):
+            return self._rebuild(df, removed, added)
+        n_kept, n_references = len(kept), len(self.index.keys)
+        new_A = self.index.incidence(np.arange(n_kept, n_kept + len(added)))
+        self.co_citation.resize((n_references, n_references))
+        old_A.resize((old_A.shape[0], n_references))
+        self.co_citation = (self.co_citation + upper_triangle_product(new_A, new_A)
+                            - upper_triangle_product(old_A, old_A))
+        self.co_citation.eliminate_zeros()
+
+        # --- Coupling: drop the removed records, couple the new ones with every record ---
+        coupling = self.coupling[kept][:, kept] if len(removed) else self.coupling
+        block = (new_A @ self.index.incidence().T).tocoo()
+        rows = block.row + n_kept
+        keep = block.col < rows
+        n = n_kept + len(added)
+        coupling.resize((n, n))
+        self.coupling = coupling + sparse.csr_matrix((block.data[keep], (block.col[keep], rows[keep])), shape=(n, n))
+
+        # --- Author table and indicator rows of the touched authors, sources and years ---
+        self.records = pd.concat([self.records.iloc[kept], delta_records], ignore_index=True)
+        old_authors = self.authors[np.isin(self.authors['article'], kept)]
+        position = np.full(len(kept) + len(removed), -1)
+        position[kept] = np.arange(n_kept)
+        new_authors = build_author_table(delta_records)
+        new_authors['article'] += n_kept
+        self.authors = pd.concat([old_authors.assign(article=position[old_authors['article']].astype(np.int32)),
+                                  new_authors], ignore_index=True)
+        self.authors['author'] = self.authors['author'].astype("category")
+        self.authors['affiliation'] = self.authors['affiliation'].astype("category")
+
+        current_year = self.records['Publication year'].max()
+        # m-quotient and hc-index depend on the current year: when it moves, every row changes
+        year_changed = current_year != previous_year
+        touched_authors = set(build_author_table(touched)['author'])
+        if year_changed:
+            touched_authors |= set(self.authors['author'])
+        table = self.authors[self.authors['author'].isin(touched_authors)]
+        self.tables["Authors"] = self._merge(self.tables["Authors"], "Author", touched_authors,
+                                             author_indicators(self.records, table, current_year))
+        for name, column in (("Sources", 'Source'), ("Publication Years", 'Publication year')):
+            keys = set(touched[column].dropna())
+            if year_changed:
+                keys |= set(self.records[column].dropna())
+            rows = self.records[self.records[column].isin(keys)]
+            self.tables[name] = self._merge(self.tables[name], column, keys,
+                                            article_indicators(rows, column, current_year))
+        return {"removed": len(removed), "added": len(added), "rebuilt": False}
+
+    def _rebuild(self, df, removed, added):
+        vars(self).update(vars(CorpusState.build(df)))
+        return {"removed": len(removed), "added": len(added), "rebuilt": True}
+
+    @staticmethod
+    def _merge(table, key_column, keys, rows):
+        kept = table[~table[key_column].isin(keys)]
+        return pd.concat([kept, rows], ignore_index=True).sort_values(key_column, ignore_index=True)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.records.to_parquet(os.path.join(path, "records.parquet"), index=False)
+        self.index.save(os.path.join(path, "references.npz"))
+        sparse.save_npz(os.path.join(path, "co_citation.npz"), self.co_citation)
+        sparse.save_npz(os.path.join(path, "coupling.npz"), self.coupling)
+        # Not authors.parquet: that is the file of the "Authors" indicator table
+        self.authors.to_parquet(os.path.join(path, "author_table.parquet"), index=False)
+        for name, table in self.tables.items():
+            table.to_parquet(os.path.join(path, f"{name.lower().replace(' ', '_')}.parquet"), index=False)
+
+    @classmethod
+    def load(cls, path):
+        tables = {name: pd.read_parquet(os.path.join(path, f"{name.lower().replace(' ', '_')}.parquet"))
+                  for name in ("Authors", "Sources", "Publication Years")}
+        return cls(pd.read_parquet(os.path.join(path, "records.parquet")),
+                   ReferenceIndex.load(os.path.join(path, "references.npz")),
+                   sparse.load_npz(os.path.join(path, "co_citation.npz")).tocsr(),
+                   sparse.load_npz(os.path.join(path, "coupling.npz")).tocsr(),
+                   pd.read_parquet(os.path.join(path, "author_table.parquet"))
+                   .astype({"author": "category", "affiliation": "category"}),
+                   tables)
+
+
+def state_path(corpus_path):
+    return os.path.splitext(corpus_path)[0] + STATE_SUFFIX
+
+
+def load_or_update(df, corpus_path):
+    """
+    Bring the state persisted next to corpus_path up to date with df, building it
+    on first use. Returns (state, {"removed": n, "added": n, "rebuilt": bool}).
+    """
+    path = state_path(corpus_path)
+    if not os.path.exists(path):
+        state = CorpusState.build(df)
+        summary = {"removed": 0, "added": len(df), "rebuilt": True}
+    else:
+        state = CorpusState.load(path)
+        summary = state.update(df)
+    if summary["added"] or summary["removed"]:
+        state.save(path)
+    return state, summary
+
+
+if __name__ == "__main__":
+    corpus_path = sys.argv[1]
+    state, summary = load_or_update(load_corpus(corpus_path), corpus_path)
+    print(f"{summary['added']} records added or changed, {summary['removed']} removed"
+          f"{' (full rebuild)' if summary['rebuilt'] else ''}; state of {len(state.records)} records saved to {state_path(corpus_path)}")
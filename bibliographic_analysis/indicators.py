@@ -0,0 +1,136 @@
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+# Contemporary h-index weighting of Sidiropoulos et al.: gamma * age^-delta
+HC_GAMMA = 4
+HC_DELTA = 1
+I10_THRESHOLD = 10
+
+
+class GroupedCitations:
+    """
+    Citations of every paper of every group (author, source, year...), sorted once
+    in descending order within each group. Indicators are computed from these
+    shared arrays, so adding an indicator adds array operations, not another scan.
+    keys, citations, years and weights are parallel arrays with one entry per
+    (group, paper); keys may be categorical (e.g. the author ids of the author
+    table) and weights are the paper's share for fractional counting.
+    """
+
+    def __init__(self, keys, citations, years=None, weights=None, current_year=None):
+        keys = pd.Categorical(keys).remove_unused_categories()
+        codes, self.names = keys.codes.astype(np.int64), np.asarray(keys.categories)
+        citations = np.nan_to_num(np.asarray(citations, dtype=np.float64)).astype(np.int64)
+        years = np.full(len(codes), np.nan) if years is None else np.asarray(years, dtype=np.float64)
+        weights = np.ones(len(codes)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        order = np.lexsort((-citations, codes))
+        self.codes = codes[order]
+        self.citations = citations[order]
+        self.years = years[order]
+        self.weights = weights[order]
+        self.counts = np.bincount(self.codes, minlength=len(self.names))
+        self.starts = np.concatenate(([0], np.cumsum(self.counts)[:-1])).astype(np.int64)
+        self.rank = np.arange(len(self.codes)) - self.starts[self.codes] + 1
+        if current_year is None:
+            current_year = np.nanmax(years) if np.isfinite(years).any() else np.nan
+        self.current_year = current_year
+
+    def __len__(self):
+        return len(self.names)
+
+    def sum(self, values):
+        return np.bincount(self.codes, weights=values, minlength=len(self.names))
+
+    def max(self, values, initial=0):
+        result = np.full(len(self.names), initial, dtype=np.result_type(values, initial))
+        np.maximum.at(result, self.codes, values)
+        return result
+
+    def cumsum(self, values):
+        """Running total of values within each group, in the sorted order."""
+        return pd.Series(values).groupby(self.codes, sort=False).cumsum().to_numpy()
+
+    @cached_property
+    def total(self):
+        return self.sum(self.citations).astype(np.int64)
+
+    @cached_property
+    def h_index(self):
+        return self.sum(self.citations >= self.rank).astype(np.int64)
+
+    @cached_property
+    def first_year(self):
+        first = np.full(len(self.names), np.inf)
+        np.minimum.at(first, self.codes, np.where(np.isnan(self.years), np.inf, self.years))
+        return np.where(np.isinf(first), np.nan, first)
+
+
+def g_index(groups):
+    return groups.max(np.where(groups.cumsum(groups.citations) >= groups.rank ** 2, groups.rank, 0))
+
+
+def e_index(groups):
+    """Square root of the h-core citations in excess of h²."""
+    h_core = groups.sum(np.where(groups.rank <= groups.h_index[groups.codes], groups.citations, 0))
+    return np.sqrt(h_core - groups.h_index ** 2)
+
+
+def m_quotient(groups):
+    """h-index divided by the years since the group's first paper (inclusive)."""
+    return groups.h_index / (groups.current_year - groups.first_year + 1)
+
+
+def hc_index(groups):
+    """h-index of the age-weighted citations gamma * (current year - year + 1)^-delta * c."""
+    age = groups.current_year - groups.years + 1
+    scores = np.nan_to_num(HC_GAMMA * np.power(np.maximum(age, 1), -HC_DELTA) * groups.citations)
+    # Same group boundaries, so re-sorting the scores inside each group keeps the ranks
+    scores = scores[np.lexsort((-scores, groups.codes))]
+    return groups.sum(scores >= groups.rank).astype(np.int64)
+
+
+def hm_index(groups):
+    """Schreiber's hm-index: the h-index with ranks advanced by each paper's author share 1/n instead of by 1."""
+    effective_rank = groups.cumsum(groups.weights)
+    return groups.max(np.where(groups.citations >= effective_rank, effective_rank, 0.0))
+
+
+# Indicator name -> (function of GroupedCitations, dtype); the columns of the wide table, in order
+INDICATORS = {
+    "Number of Articles": (lambda groups: groups.counts, "int64"),
+    "Total Citations": (lambda groups: groups.total, "int64"),
+    "Average Citations": (lambda groups: groups.total / groups.counts, "float64"),
+    "h-index": (lambda groups: groups.h_index, "int64"),
+    "g-index": (g_index, "int64"),
+    "i10-index": (lambda groups: groups.sum(groups.citations >= I10_THRESHOLD), "int64"),
+    "e-index": (e_index, "float64"),
+    "m-quotient": (m_quotient, "float64"),
+    "hc-index": (hc_index, "int64"),
+    "First Year": (lambda groups: groups.first_year, "Int64"),
+    "Fractional Articles": (lambda groups: groups.sum(groups.weights), "float64"),
+    "Fractional Citations": (lambda groups: groups.sum(groups.weights * groups.citations), "float64"),
+    "hm-index": (hm_index, "float64"),
+}
+FRACTIONAL_INDICATORS = ["Fractional Articles", "Fractional Citations", "hm-index"]
+
+
+def indicator_table(groups, key_column, indicators=None):
+    """Wide table with one row per group (sorted by key) and one typed column per indicator."""
+    indicators = list(INDICATORS) if indicators is None else indicators
+    table = pd.DataFrame({key_column: groups.names})
+    for name in indicators:
+        function, dtype = INDICATORS[name]
+        table[name] = pd.array(np.asarray(function(groups)), dtype=dtype)
+    return table
+
+
+def article_indicators(df, key_column, current_year=None):
+    """Indicators of the articles grouped by one corpus column (e.g. 'Source' or 'Publication year')."""
+    rows = df[df[key_column].notna()]
+    groups = GroupedCitations(rows[key_column], rows['Times Cited'], rows['Publication year'],
+                              current_year=current_year if current_year is not None else df['Publication year'].max())
+    indicators = [name for name in INDICATORS if name not in FRACTIONAL_INDICATORS]
+    return indicator_table(groups, key_column, indicators)
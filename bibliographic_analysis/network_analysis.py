@@ -1,63 +1,50 @@
 # centrality_analysis_fast.py
 import streamlit as st
-import pandas as pd
-import networkx as nx
-from pyvis.network import Network
 import streamlit.components.v1 as components
-import itertools
 
-def show():
-    st.title("Interactive Centrality - Fast Version")
+from analyses import centrality_table, co_citation_pairs, full_graph_lod
+from graph_export import centrality_attributes, static_network
+from graph_layout import graph_positions, lod_html, with_node_sizes
+from graph_render import render_html
+from session import WORKERS, reference_index
+
+CENTRALITY_MODES = {"Approximate (sampled pivots)": "approximate", "Exact": "exact"}
+
+@st.cache_data(show_spinner="Calculating centrality metrics...")
+def centrality_graph(corpus_key, _df, mode="approximate"):
+    # --- Centrality on the entire co-citation graph, graph of the top 200 pairs for the visualization ---
+    return centrality_table(reference_index(corpus_key, _df), mode=mode, workers=WORKERS)
+
+@st.cache_data(show_spinner="Laying out the full co-citation graph...")
+def co_citation_lod(corpus_key, _df):
+    # --- Layout and clusters of the whole co-citation graph, shared by every size metric ---
+    return full_graph_lod(*co_citation_pairs(reference_index(corpus_key, _df)))
 
-    # --- Upload Excel File ---
-    uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
+@st.cache_data(show_spinner=False)
+def centrality_graph_html(corpus_key, _df, mode, metric):
+    # Centrality rows and lod nodes are both the nodes of the same co-citation adjacency, in order
+    centrality_df, _, _ = centrality_graph(corpus_key, _df, mode)
+    return lod_html(with_node_sizes(co_citation_lod(corpus_key, _df), centrality_df[metric].to_numpy()))
 
-    if uploaded_file:
-        df = pd.read_excel(uploaded_file)
+def show(df=None, corpus_key=None):
+    st.title("Interactive Centrality - Fast Version")
+
+    if df is not None:
         st.write("First rows of the file:")
         st.dataframe(df.head())
 
-        # --- Prepare reference pairs for graph ---
-        all_pairs = []
-        for refs in df['Article References'].dropna():
-            refs_list = [r.strip() for r in refs.split(';') if r.strip()]
-            cleaned_refs = []
-            for r in refs_list:
-                parts = r.split(',')
-                if len(parts) >= 2:
-                    ref_id = parts[0].strip() + " (" + parts[1].strip() + ")"
-                    cleaned_refs.append(ref_id)
-                else:
-                    cleaned_refs.append(r)
-            for combo in itertools.combinations(sorted(set(cleaned_refs)), 2):
-                all_pairs.append(combo)
-
-        # --- Count pair frequency ---
-        pairs_df = pd.DataFrame(all_pairs, columns=['Ref1', 'Ref2'])
-        co_citation_counts = pairs_df.value_counts().reset_index(name='Count')
-
-        # --- Filter top pairs for quick graph ---
-        top_pairs = co_citation_counts.sort_values("Count", ascending=False).head(200)
-
-        # --- Create graph ---
-        G = nx.Graph()
-        for _, row in top_pairs.iterrows():
-            G.add_edge(row['Ref1'], row['Ref2'], weight=row['Count'])
-
-        st.write(f"Graph created with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges.")
-
-        # --- Calculate centrality metrics only on filtered nodes ---
-        with st.spinner("Calculating centrality metrics..."):
-            betweenness = nx.betweenness_centrality(G, weight='weight', normalized=True)
-            eigenvector = nx.eigenvector_centrality(G, max_iter=1000, weight='weight')
-            closeness = nx.closeness_centrality(G)
-
-        centrality_df = pd.DataFrame({
-            'Node': list(G.nodes()),
-            'Betweenness': [betweenness[n] for n in G.nodes()],
-            'Eigenvector': [eigenvector[n] for n in G.nodes()],
-            'Closeness': [closeness[n] for n in G.nodes()]
-        })
+        mode = st.radio("Centrality mode:", list(CENTRALITY_MODES), horizontal=True,
+                        help="Exact betweenness and closeness use every reference as a source and "
+                             "can take minutes on large corpora.")
+        centrality_df, G, timings = centrality_graph(corpus_key, df, CENTRALITY_MODES[mode])
+        betweenness, eigenvector, closeness = (dict(zip(centrality_df['Node'], centrality_df[name]))
+                                               for name in ('Betweenness', 'Eigenvector', 'Closeness'))
+
+        st.write(f"Centrality computed on {len(betweenness)} co-cited references; "
+                 f"graph of the top pairs created with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges.")
+        st.caption(f"Computed in {timings['Total']:.1f}s across {WORKERS} processes (wall time summed over tasks: "
+                   + ", ".join(f"{metric} {seconds:.1f}s" for metric, seconds in timings.items() if metric != 'Total')
+                   + ").")
 
         st.subheader("Centrality Table")
         st.dataframe(centrality_df.sort_values(by='Betweenness', ascending=False))
@@ -70,37 +57,22 @@ def show():
         metric_for_size = st.selectbox("Choose node size metric:",
                                     ["Betweenness", "Eigenvector", "Closeness"])
 
-        G_vis = Network(height="600px", width="100%", notebook=False, bgcolor="#ffffff", font_color="black")
-
-        # --- Highlight top 10 for each metric ---
-        top10_betweenness = sorted(betweenness, key=betweenness.get, reverse=True)[:10]
-        top10_eigenvector = sorted(eigenvector, key=eigenvector.get, reverse=True)[:10]
-        top10_closeness = sorted(closeness, key=closeness.get, reverse=True)[:10]
-
-        for node in G.nodes():
-            size = 15 + centrality_df.loc[centrality_df['Node'] == node, metric_for_size].values[0]*50
-
-            # Color by highlight
-            if node in top10_betweenness:
-                color = "red"
-            elif node in top10_eigenvector:
-                color = "blue"
-            elif node in top10_closeness:
-                color = "green"
-            else:
-                color = "lightgray"
-
-            border = 5 if node in top10_betweenness + top10_eigenvector + top10_closeness else 1
-
-            G_vis.add_node(node, label=node, size=size, color=color, borderWidth=border,
-                        title=f"Betweenness: {betweenness[node]:.4f}\n"
-                              f"Eigenvector: {eigenvector[node]:.4f}\n"
-                              f"Closeness: {closeness[node]:.4f}")
-
-        for u, v, data in G.edges(data=True):
-            G_vis.add_edge(u, v, value=data['weight'])
+        # Positions are computed here once, so the browser runs no physics
+        G_vis = static_network(G, G.nodes(), graph_positions(G),
+                               **centrality_attributes(G.nodes(), betweenness, eigenvector, closeness, metric_for_size))
 
         # --- Render graph in Streamlit ---
-        G_vis.save_graph("centrality_graph_fast.html")
-        HtmlFile = open("centrality_graph_fast.html", 'r', encoding='utf-8').read()
-        components.html(HtmlFile, height=600)
+        components.html(render_html(G_vis), height=600)
+
+        # --- Every co-cited reference, clusters collapsed into super-nodes, sized by the same metric ---
+        if st.checkbox("Show the full co-citation graph",
+                       help="Every reference of the centrality table at a precomputed position, "
+                            "its Louvain clusters starting collapsed."):
+            html = centrality_graph_html(corpus_key, df, CENTRALITY_MODES[mode], metric_for_size)
+            st.caption(f"Nodes sized by {metric_for_size.lower()}. Double-click a cluster to expand it "
+                       "and a node to collapse it again.")
+            components.html(html, height=800)
+            st.download_button("Download Full Centrality Graph", html, "centrality_full_graph.html", "text/html")
+
+    else:
+        st.info("Please upload a corpus file in the sidebar.")
@@ -1,25 +1,25 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
-def show():
-    st.title("Performance Analysis")
+import analyses
+from session import author_table
 
-    # Excel file upload
-    uploaded_file = st.file_uploader("Upload Excel file", type=["xlsx"])
+@st.cache_data(show_spinner="Calculating author metrics...")
+def author_metrics(corpus_key, _df):
+    # --- Metrics of all authors at once, from the shared (article, author) table ---
+    df_results = analyses.author_metrics(_df, author_table(corpus_key, _df))
+    return len(df_results), df_results
 
-    if uploaded_file:
-        # Load Excel file
-        df = pd.read_excel(uploaded_file)
+@st.cache_data(show_spinner="Calculating indicators...")
+def indicator_tables(corpus_key, _df):
+    # --- Every indicator per author, source and year, one wide table each ---
+    return analyses.indicator_tables(_df, author_table(corpus_key, _df))
 
-        # --- Total number of unique authors ---
-        all_authors = df['Authors'].astype(str).str.split(',').explode().str.strip().unique()
-        num_authors = len(all_authors)
+def show(df=None, corpus_key=None):
+    st.title("Performance Analysis")
 
-        df_authors = df.assign(Authors=df['Authors'].astype(str).str.split(',')) \
-                       .explode('Authors')
-        df_authors['Authors'] = df_authors['Authors'].str.strip()
+    if df is not None:
+        num_authors, df_results = author_metrics(corpus_key, df)
 
         # --- Total and average citations ---
         total_citations = df['Times Cited'].sum()
@@ -31,37 +31,6 @@ def show():
         col2.metric("Total Citations", int(total_citations))
         col3.metric("Average Citations", round(avg_citations, 2))
 
-        # --- Functions to calculate h-index and g-index ---
-        def h_index(citations):
-            citations = sorted(citations, reverse=True)
-            h = sum(c >= i + 1 for i, c in enumerate(citations))
-            return h
-
-        def g_index(citations):
-            citations = sorted(citations, reverse=True)
-            total = 0
-            g = 0
-            for i, c in enumerate(citations, start=1):
-                total += c
-                if total >= i**2:
-                    g = i
-            return g
-
-        # --- Calculate metrics per author ---
-        results = []
-        for author, group in df_authors.groupby("Authors"):
-            citations = group['Times Cited'].fillna(0).astype(int).tolist()
-            results.append({
-                "Author": author,
-                "Number of Articles": len(citations),
-                "Total Citations": sum(citations),
-                "Average Citations": sum(citations) / len(citations) if citations else 0,
-                "h-index": h_index(citations),
-                "g-index": g_index(citations)
-            })
-
-        df_results = pd.DataFrame(results)
-
         # --- Main Results Table ---
         st.subheader("Author Metrics Table")
         st.dataframe(df_results)
@@ -121,10 +90,23 @@ def show():
                            "top10_g_index.csv",
                            "text/csv")
 
+        # --- Indicator Library ---
+        st.subheader("Indicators")
+        tables = indicator_tables(corpus_key, df)
+        group_by = st.selectbox("Indicators per:", list(tables))
+        st.caption("i10: papers with at least 10 citations; e-index: h-core citations beyond h²; "
+                   "m-quotient: h-index per year since the first paper; hc-index: h-index of age-weighted "
+                   "citations (4 × citations / age); fractional columns count each paper 1 / number of authors.")
+        st.dataframe(tables[group_by])
+        st.download_button("Download Indicators as CSV",
+                           tables[group_by].to_csv(index=False).encode("utf-8"),
+                           f"indicators_{group_by.lower().replace(' ', '_')}.csv",
+                           "text/csv")
+
         # --- Missing Citation Information ---
         st.subheader("Articles Missing Citation Information")
 
-        missing_citations = df[df['Times Cited'].isna()][['Title', 'Publication year']]
+        missing_citations, year_table = analyses.missing_citations(df)
         count_missing = len(missing_citations)
         total_articles = len(df)
         percentage_missing = (count_missing / total_articles * 100) if total_articles > 0 else 0
@@ -160,18 +142,6 @@ def show():
         if total_missing == 0:
             st.info("No articles with missing citation information to summarize.")
         else:
-            # Count per year (keep 'Unknown' if year is missing)
-            year_counts = (
-                missing_citations
-                .assign(**{'Publication year': missing_citations['Publication year'].fillna('Unknown')})
-                .groupby('Publication year')
-                .size()
-                .sort_values(ascending=False)  # sort by count/percentage desc
-            )
-
-            year_table = year_counts.reset_index(name="Count")
-            year_table["Percentage"] = (year_table["Count"] / total_missing * 100).round(2)
-
             st.dataframe(year_table)
             st.download_button(
                 "Download Missing-by-Year (CSV)",
@@ -183,15 +153,12 @@ def show():
                     # --- Most Cited Articles per Year (with >200 citations) ---
         st.subheader("Most Cited Articles per Year (Citations > 100)")
 
-        # Filter articles with more than 200 citations
-        high_cited = df[df["Times Cited"] > 100][["Title", "Publication year", "Times Cited"]]
+        # Articles with more than 100 citations, sorted by year and citations
+        high_cited = analyses.highly_cited_articles(df)
 
         if high_cited.empty:
             st.info("No articles with more than 200 citations found.")
         else:
-            # Sort by year and citations
-            high_cited = high_cited.sort_values(["Publication year", "Times Cited"], ascending=[True, False])
-
             # Plot: bar chart with year on x-axis, citations on y-axis
             fig, ax = plt.subplots(figsize=(10, 6))
             for year, group in high_cited.groupby("Publication year"):
@@ -218,7 +185,7 @@ def show():
                     # --- Authors with More Than 100 Total Citations ---
         st.subheader("Authors with More Than 100 Total Citations")
 
-        authors_over_100 = df_results[df_results["Total Citations"] > 100] \
+        authors_over_100 = df_results[df_results["Total Citations"] > analyses.HIGHLY_CITED] \
                               .sort_values("Total Citations", ascending=False)
 
         if authors_over_100.empty:
@@ -240,17 +207,11 @@ def show():
             st.warning("No 'Publication year' column found in the dataset.")
         else:
             # Count articles per year
-            articles_per_year = (
-                df["Publication year"]
-                .dropna()
-                .astype(int)
-                .value_counts()
-                .sort_index()
-            )
+            year_table = analyses.articles_per_year(df)
 
             # Plot
             fig, ax = plt.subplots(figsize=(10, 6))
-            articles_per_year.plot(kind="bar", ax=ax)
+            year_table.set_index("Publication Year")["Number of Articles"].plot(kind="bar", ax=ax)
 
             ax.set_xlabel("Publication Year")
             ax.set_ylabel("Number of Articles")
@@ -259,8 +220,6 @@ def show():
             st.pyplot(fig)
 
             # Show data table
-            year_table = articles_per_year.reset_index()
-            year_table.columns = ["Publication Year", "Number of Articles"]
             st.dataframe(year_table)
 
             st.download_button(
@@ -300,11 +259,8 @@ def show():
                 # --- Lorenz Curve of Author Citations with Gini Coefficient ---
         st.subheader("Lorenz Curve of Citations Across Authors")
 
-        # Sort authors by total citations
-        sorted_citations = np.sort(df_results["Total Citations"].values)
-        cumulative_citations = np.cumsum(sorted_citations)
-        cumulative_citations = cumulative_citations / cumulative_citations[-1]  # normalize to 1
-        x_axis = np.arange(1, len(sorted_citations) + 1) / len(sorted_citations)
+        # Authors sorted by total citations, with the Gini coefficient of the curve
+        x_axis, cumulative_citations, gini = analyses.lorenz_curve(df_results["Total Citations"].values)
 
         fig, ax = plt.subplots(figsize=(8, 6))
         ax.plot(x_axis, cumulative_citations, label="Lorenz Curve", color="blue")
@@ -313,11 +269,6 @@ def show():
         ax.set_ylabel("Cumulative Share of Citations")
         ax.set_title("Lorenz Curve of Citations")
 
-        # Compute Gini coefficient
-        n = len(sorted_citations)
-        cumulative_sum = np.cumsum(sorted_citations)
-        gini = (n + 1 - 2 * np.sum(cumulative_sum) / cumulative_sum[-1]) / n
-
         st.pyplot(fig)
         st.markdown(f"**Gini Coefficient of Citations:** {gini:.3f}")
 
@@ -329,16 +280,11 @@ def show():
             st.warning("No 'Publication year' column found in the dataset.")
         else:
             # Aggregate per year
-            df_year = df.copy()
-            df_year = df_year.dropna(subset=["Publication year"])
-            df_year["Publication year"] = df_year["Publication year"].astype(int)
-
-            pubs_per_year = df_year.groupby("Publication year").size()
-            citations_per_year = df_year.groupby("Publication year")["Times Cited"].sum()
+            per_year = analyses.citations_per_year(df)
 
             fig, ax = plt.subplots(figsize=(10, 6))
-            ax.plot(pubs_per_year.index, pubs_per_year.values, marker='o', label="Publications per Year")
-            ax.plot(citations_per_year.index, citations_per_year.values, marker='s', label="Citations per Year")
+            ax.plot(per_year["Publication Year"], per_year["Publications"], marker='o', label="Publications per Year")
+            ax.plot(per_year["Publication Year"], per_year["Citations"], marker='s', label="Citations per Year")
             ax.set_xlabel("Year")
             ax.set_ylabel("Count")
             ax.set_title("Publications and Citations per Year")
@@ -348,19 +294,16 @@ def show():
         # --- Average Citations per Paper per Year ---
         st.subheader("Average Citations per Paper per Year")
 
-        # Compute average citations
-        avg_citations_per_year = citations_per_year / pubs_per_year
+        avg_table = analyses.citations_per_year(df)[["Publication Year", "Average Citations per Paper"]]
 
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(avg_citations_per_year.index, avg_citations_per_year.values, marker='o', color='purple')
+        ax.plot(avg_table["Publication Year"], avg_table["Average Citations per Paper"], marker='o', color='purple')
         ax.set_xlabel("Publication Year")
         ax.set_ylabel("Average Citations per Paper")
         ax.set_title("Average Citations per Paper per Year")
         st.pyplot(fig)
 
         # Show table
-        avg_table = avg_citations_per_year.reset_index()
-        avg_table.columns = ["Publication Year", "Average Citations per Paper"]
         st.dataframe(avg_table)
 
         st.download_button(
@@ -369,3 +312,6 @@ def show():
             "avg_citations_per_paper.csv",
             "text/csv"
         )
+
+    else:
+        st.info("Please upload a corpus file in the sidebar.")
@@ -1,52 +1,26 @@
 import streamlit as st
-import pandas as pd
-import re
 import matplotlib.pyplot as plt
 
+import analyses
+from corpus import CORPUS_TYPES
+from session import load_uploaded_corpus
+
 def show():
     st.title("📊 Model Analysis in Articles")
 
     # Upload Excel file
-    uploaded_file = st.file_uploader("Upload Excel file", type=["xlsx", "xls", "csv"])
+    uploaded_file = st.file_uploader("Upload Excel file", type=CORPUS_TYPES + ["xls"])
 
     if uploaded_file:
-        # Load the data
-        if uploaded_file.name.endswith(".csv"):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file)
-
-        # Handle null values in 'status' column
-        df["status"] = df["status"].fillna("").astype(str)
-
-        # Identify articles and models
-        articles = []
-        models = []
-
-        current_article = None
-        for _, row in df.iterrows():
-            if row["status"] == "TITLE":
-                current_article = row["data"]
-                articles.append({"article": current_article, "models": []})
-            else:
-                if current_article:
-                    models.append({
-                        "article": current_article,
-                        "model": row["data"],
-                        "used": str(row["status"]).strip().lower() == "sim"
-                    })
-                    articles[-1]["models"].append(row["data"])
-
-        models_df = pd.DataFrame(models)
-
-        # Cited and used models
-        cited = models_df[models_df["used"] == False]["model"].value_counts().rename_axis("Model").reset_index(name="Citations")
-        used = models_df[models_df["used"] == True]["model"].value_counts().rename_axis("Model").reset_index(name="Uses")
-
-        # Articles with no models
-        articles_without_models = [a["article"] for a in articles if len(a["models"]) == 0]
-        articles_without_models_df = pd.DataFrame(articles_without_models, columns=["Articles Without Models"])
-        num_articles_without_models = len(articles_without_models)
+        # Load the data (cached by file content, so it is not re-read on every rerun)
+        df, _ = load_uploaded_corpus(uploaded_file)
+
+        # Identify articles and models, and count citations and uses per model
+        articles, models_df = analyses.parse_models(df)
+        tables = analyses.model_tables(articles, models_df)
+        cited, used = tables["cited_models"], tables["used_models"]
+        articles_without_models_df = tables["articles_without_models"]
+        num_articles_without_models = len(articles_without_models_df)
 
         # --- Display results ---
         st.subheader("📑 Cited Models")
@@ -64,16 +38,7 @@ def show():
         # --- Bar Chart: Models used ≥5 (+ "Other") ---
         st.subheader("📊 Used Models (bar chart - used ≥5)")
         if not models_df.empty:
-            model_usage = models_df.groupby("model")["used"].sum().sort_values(ascending=False)
-
-            top_used = model_usage[model_usage >= 5]
-            others = model_usage[model_usage < 5].sum()
-
-            if others > 0:
-                top_used["Other models"] = others
-
-            if num_articles_without_models > 0:
-                top_used["Articles without models"] = num_articles_without_models
+            top_used = analyses.top_counts(models_df.groupby("model")["used"].sum(), num_articles_without_models)
 
             fig, ax = plt.subplots(figsize=(8, 5))
             bars = ax.bar(top_used.index, top_used.values)
@@ -92,16 +57,8 @@ def show():
         # --- Bar Chart: Models cited ≥5 (+ "Other") ---
         st.subheader("📊 Cited Models (bar chart - cited ≥5)")
         if not models_df.empty:
-            cited_count = (~models_df["used"]).groupby(models_df["model"]).sum().sort_values(ascending=False)
-
-            top_cited = cited_count[cited_count >= 5]
-            other_cited = cited_count[cited_count < 5].sum()
-
-            if other_cited > 0:
-                top_cited["Other models"] = other_cited
-
-            if num_articles_without_models > 0:
-                top_cited["Articles without models"] = num_articles_without_models
+            top_cited = analyses.top_counts((~models_df["used"]).groupby(models_df["model"]).sum(),
+                                            num_articles_without_models)
 
             fig_c, ax_c = plt.subplots(figsize=(8, 5))
             bars_c = ax_c.bar(top_cited.index, top_cited.values)
@@ -119,16 +76,8 @@ def show():
 
         # --- Cited Models per Year ---
         st.subheader("📈 Cited Models by Year")
-        years = []
-        for a in articles:
-            match = re.search(r"(19|20)\d{2}", a["article"])
-            if match:
-                year = match.group(0)
-                for m in a["models"]:
-                    years.append(year)
-
-        if years:
-            years_df = pd.Series(years).value_counts().sort_index()
+        years_df = analyses.cited_models_per_year(articles)
+        if not years_df.empty:
             fig2, ax2 = plt.subplots(figsize=(8, 5))
             bars2 = ax2.bar(years_df.index, years_df.values)
 
@@ -145,17 +94,14 @@ def show():
             st.info("Could not extract years from article titles.")
 
         # --- Summary table: citations and uses per model ---
-        summary = models_df.groupby("model").agg(
-            citations=("used", lambda x: (~x).sum()),
-            uses=("used", "sum")
-        ).reset_index()
+        summary = tables["summary_table"]
 
         st.subheader("📋 Summary Table: Citations and Uses")
         st.dataframe(summary)
         st.download_button("Download Summary Table CSV", summary.to_csv(index=False).encode("utf-8"), "summary_table.csv", "text/csv")
 
         # --- Line Chart: Top 10 Cited Models ---
-        top_models = summary[summary["citations"] >= 5]
+        top_models = summary[summary["citations"] >= analyses.MODEL_THRESHOLD]
 
         plt.figure(figsize=(10, 6))
         plt.plot(top_models["model"], top_models["citations"], marker="o", label="Citations")
@@ -169,7 +115,7 @@ def show():
 
         # --- Specific model lists ---
 
-        only_used = summary[(summary["citations"] == 0) & (summary["uses"] > 0)]
+        only_used = tables["only_used_models"]
         st.subheader("📋 Models Only Used (Not Cited)")
         if not only_used.empty:
             st.dataframe(only_used)
@@ -177,7 +123,7 @@ def show():
         else:
             st.info("No models are used but not cited.")
 
-        only_cited = summary[(summary["citations"] > 0) & (summary["uses"] == 0)]
+        only_cited = tables["only_cited_models"]
         st.subheader("📋 Models Only Cited (Not Used)")
         if not only_cited.empty:
             st.dataframe(only_cited)
@@ -185,7 +131,7 @@ def show():
         else:
             st.info("No models are cited but not used.")
 
-        used_more_than_cited = summary[summary["uses"] > summary["citations"]]
+        used_more_than_cited = tables["used_more_than_cited"]
         st.subheader("📋 Models Used More Than Cited")
         if not used_more_than_cited.empty:
             st.dataframe(used_more_than_cited)
@@ -193,8 +139,8 @@ def show():
         else:
             st.info("No models are used more than cited.")
 
-        cited_more_than_used = summary[summary["citations"] > summary["uses"]]
+        cited_more_than_used = tables["cited_more_than_used"]
         st.subheader("📋 Models Cited More Than Used")
         if not cited_more_than_used.empty:
             st.dataframe(cited_more_than_used)
-            st.download_button("Download Models Cited More Than Used CSV", used_more_than_cited.to_csv(index=False).encode("utf-8"), "cited_more_than_used.csv", "text/csv")
+            st.download_button("Download Models Cited More Than Used CSV", cited_more_than_used.to_csv(index=False).encode("utf-8"), "cited_more_than_used.csv", "text/csv")
@@ -0,0 +1,152 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from reference_matching import deduplicate_references
+
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/[^\s;,\"<>]+", re.IGNORECASE)
+QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'", "‐": "-", "–": "-", "—": "-"})
+INDEX_SUFFIX = ".refindex.npz"
+
+
+def split_references(refs):
+    """Split an 'Article References' cell into its non-empty references."""
+    if pd.isna(refs):
+        return []
+    return [r.strip() for r in str(refs).split(';') if r.strip()]
+
+
+def normalize_reference(reference):
+    """
+    Normalized key of a reference: "doi:<lowercase DOI>" when the reference is
+    or contains a DOI, otherwise the text with unified quotes and dashes,
+    collapsed whitespace, no trailing punctuation and folded case.
+    """
+    doi = DOI_PATTERN.search(reference)
+    if doi:
+        return "doi:" + doi.group(0).rstrip(".").lower()
+    text = " ".join(reference.translate(QUOTES).split()).strip(" .")
+    return text.casefold()
+
+
+def _pack_strings(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data, offsets):
+    raw = data.tobytes()
+    return np.array([raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)], dtype=object)
+
+
+class ReferenceIndex:
+    """
+    Every reference of a corpus parsed, normalized and interned once.
+    keys[i] is the normalized key of reference id i and labels[i] the form it was
+    first seen in; the references of corpus row r are indices[indptr[r]:indptr[r + 1]].
+    canonical[i] is the id that reference i is counted as (itself unless merged).
+    """
+
+    def __init__(self, keys, labels, indptr, indices, canonical=None):
+        self.keys = keys
+        self.labels = labels
+        self.indptr = indptr
+        self.indices = indices
+        self.canonical = np.arange(len(keys)) if canonical is None else canonical
+
+    @classmethod
+    def build(cls, references):
+        """Build the index from the 'Article References' column, one row per corpus row."""
+        return cls(np.array([], dtype=object), np.array([], dtype=object),
+                   np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64)).extend(references)
+
+    def extend(self, references):
+        """
+        New index with one row per cell of references appended. Known references
+        keep their ids and canonical ids; new references get the next free ids.
+        """
+        ids = {key: i for i, key in enumerate(self.keys)}
+        labels = []
+        indptr = [self.indptr[-1]]
+        indices = []
+        for refs in references:
+            row = set()
+            for reference in split_references(refs):
+                key = normalize_reference(reference)
+                if key not in ids:
+                    ids[key] = len(ids)
+                    labels.append(reference)
+                row.add(ids[key])
+            indices.extend(sorted(row))
+            indptr.append(indptr[0] + len(indices))
+        return ReferenceIndex(np.array(list(ids), dtype=object),
+                              np.concatenate([self.labels, np.array(labels, dtype=object)]),
+                              np.concatenate([self.indptr, np.asarray(indptr[1:], dtype=np.int64)]),
+                              np.concatenate([self.indices, np.asarray(indices, dtype=np.int64)]),
+                              np.concatenate([self.canonical, np.arange(len(self.keys), len(ids))]))
+
+    def select(self, rows):
+        """New index with only the given corpus rows, in that order; reference ids are kept."""
+        rows = np.asarray(rows, dtype=np.int64)
+        sizes = self.row_sizes[rows]
+        indptr = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        positions = np.repeat(self.indptr[rows] - indptr[:-1], sizes) + np.arange(indptr[-1])
+        return ReferenceIndex(self.keys, self.labels, indptr, self.indices[positions], self.canonical)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def row_sizes(self):
+        return np.diff(self.indptr)
+
+    def rows_with_references(self):
+        return np.flatnonzero(self.row_sizes > 0)
+
+    def incidence(self, rows=None):
+        """0/1 CSR matrix of the given corpus rows (all by default) x canonical reference ids."""
+        A = sparse.csr_matrix((np.ones(len(self.indices), dtype=np.int32), self.canonical[self.indices], self.indptr),
+                              shape=(len(self.indptr) - 1, len(self.keys)))
+        if rows is not None:
+            A = A[rows]
+        # References merged into the same canonical id count once per article
+        A.sum_duplicates()
+        A.data[:] = 1
+        return A
+
+    def save(self, path):
+        keys, key_offsets = _pack_strings(self.keys)
+        labels, label_offsets = _pack_strings(self.labels)
+        np.savez_compressed(path, keys=keys, key_offsets=key_offsets, labels=labels, label_offsets=label_offsets,
+                            indptr=self.indptr, indices=self.indices, canonical=self.canonical)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(_unpack_strings(data["keys"], data["key_offsets"]),
+                       _unpack_strings(data["labels"], data["label_offsets"]),
+                       data["indptr"], data["indices"], data["canonical"])
+
+
+def index_path(corpus_path):
+    return os.path.splitext(corpus_path)[0] + INDEX_SUFFIX
+
+
+def load_or_build(df, corpus_path=None):
+    """
+    Load the index persisted next to corpus_path, building and saving it when missing or stale.
+    Built indexes have their near-duplicate references merged.
+    """
+    path = index_path(corpus_path) if corpus_path is not None else None
+    if path is not None and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(corpus_path):
+        return ReferenceIndex.load(path)
+    index = ReferenceIndex.build(df['Article References'])
+    deduplicate_references(index)
+    if path is not None:
+        index.save(path)
+    return index
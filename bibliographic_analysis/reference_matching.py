@@ -0,0 +1,182 @@
+import re
+
+import numpy as np
+
+YEAR_PATTERN = re.compile(r"\b(1[89]\d{2}|20\d{2})\b")
+WORD_PATTERN = re.compile(r"[^\W\d_]{2,}")
+STOPWORDS = {"a", "an", "the", "on", "of", "in", "and", "for", "to"}
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def clean_text(key):
+    return " ".join(re.sub(r"[^\w\s]", " ", key).casefold().split())
+
+
+def block_keys(text, words=2):
+    """
+    Blocking keys of a reference: its publication year with each of the first
+    significant words, so that a reference without its author still shares a
+    block with the full form (first author, title) of the same work.
+    """
+    year = YEAR_PATTERN.search(text)
+    year = year.group(0) if year else ""
+    significant = [word for word in WORD_PATTERN.findall(text) if word not in STOPWORDS][:words]
+    return [f"{year}|{word}" for word in significant] or [f"{year}|"]
+
+
+def shingles(text, size=3):
+    text = text.replace(" ", "")
+    return {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+
+
+def minhash_signatures(shingle_sets, num_perm=64, seed=0):
+    """
+    MinHash signature (num_perm values) of every shingle set, computed one
+    permutation at a time over all sets with np.minimum.reduceat.
+    """
+    if not shingle_sets:
+        return np.empty((0, num_perm), dtype=np.uint64)
+    ids = {}
+    shingle_ids = np.fromiter((ids.setdefault(s, len(ids)) for shingle_set in shingle_sets for s in shingle_set),
+                              dtype=np.uint64)
+    starts = np.zeros(len(shingle_sets), dtype=np.int64)
+    np.cumsum([len(s) for s in shingle_sets[:-1]], out=starts[1:])
+
+    rng = np.random.default_rng(seed)
+    # (a * x + b) mod p with a, b, x < p = 2**31 - 1 never overflows uint64
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint64)
+    for p in range(num_perm):
+        signatures[:, p] = np.minimum.reduceat((a[p] * shingle_ids + b[p]) % MERSENNE_PRIME, starts)
+    return signatures
+
+
+def similar(first, second, threshold, containment=0.95, min_containment_size=40, min_size_ratio=0.75):
+    shared = len(first & second)
+    if shared / len(first | second) >= threshold:
+        return True
+    # A reference truncated in one of the citing articles; short titles and
+    # titles missing a long subtitle are too ambiguous to merge on containment
+    smaller, larger = sorted((len(first), len(second)))
+    return (smaller >= min_containment_size and smaller >= min_size_ratio * larger
+            and shared / smaller >= containment)
+
+
+def candidate_pairs(blocks, signatures, bands):
+    """Pairs of references that share a block key and an LSH band bucket."""
+    rows = signatures.shape[1] // bands
+    # One entry per (reference, block key)
+    items = np.repeat(np.arange(len(blocks)), [len(keys) for keys in blocks])
+    block_ids = np.unique(np.array([key for keys in blocks for key in keys], dtype=object),
+                          return_inverse=True)[1].astype(np.uint64)
+    signatures = signatures[items]
+    pairs = set()
+    for band in range(bands):
+        keys = np.column_stack([block_ids.ravel(), signatures[:, band * rows:(band + 1) * rows]])
+        _, buckets, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+        buckets = buckets.ravel()
+        colliding = np.flatnonzero(counts[buckets] > 1)
+        colliding = colliding[np.argsort(buckets[colliding], kind="stable")]
+        boundaries = np.flatnonzero(np.diff(buckets[colliding])) + 1
+        for members in np.split(items[colliding], boundaries):
+            members = np.unique(members)
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pairs.add((int(i), int(j)))
+    return pairs
+
+
+def find_duplicates(texts, threshold=0.8, num_perm=64, bands=16, seed=0):
+    """
+    Cluster near-duplicate reference texts.
+    References are blocked on (year, leading words) and only pairs that also
+    collide in a MinHash LSH band are compared, so the work grows with the
+    number of likely duplicates rather than with the square of the references.
+    Returns a list of matched (i, j) pairs.
+    """
+    cleaned = [clean_text(text) for text in texts]
+    blocks = [block_keys(text) for text in cleaned]
+    shingle_sets = [shingles(text) for text in cleaned]
+    signatures = minhash_signatures(shingle_sets, num_perm, seed)
+
+    return [(i, j) for i, j in candidate_pairs(blocks, signatures, bands)
+            if similar(shingle_sets[i], shingle_sets[j], threshold)]
+
+
+def cluster_labels(n, pairs):
+    """Union-find over matched pairs; returns the cluster root of every item."""
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    return np.array([find(i) for i in range(n)])
+
+
+def deduplicate_references(index, threshold=0.8, num_perm=64, bands=16, seed=0):
+    """
+    Merge near-duplicate references of a ReferenceIndex by writing canonical ids
+    into index.canonical. Each cluster is represented by its most cited member.
+    DOI keys are exact already and are left out. Returns the number of merged references.
+    """
+    candidates = np.array([i for i, key in enumerate(index.keys) if not key.startswith("doi:")], dtype=np.int64)
+    pairs = find_duplicates([index.keys[i] for i in candidates], threshold, num_perm, bands, seed)
+    roots = cluster_labels(len(candidates), pairs)
+
+    citations = np.bincount(index.indices, minlength=len(index.keys))
+    canonical = np.arange(len(index.keys))
+    order = np.argsort(roots, kind="stable")
+    boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+    for cluster in np.split(order, boundaries):
+        if len(cluster) > 1:
+            members = candidates[cluster]
+            canonical[members] = members[np.argmax(citations[members])]
+    index.canonical = canonical
+    return int((canonical != np.arange(len(canonical))).sum())
+
+
+def deduplicate_new_references(index, first_new, threshold=0.8, num_perm=64, bands=16, seed=0):
+    """
+    Merge the references with ids from first_new, appended to an index whose older
+    references are deduplicated already, as deduplicate_references would. Only the
+    older references sharing a block key with a new one can match it, so only those
+    are compared. A new reference joins the cluster of the older ones it matches,
+    which keeps its representative even if another member is now cited more; a
+    cluster of new references only is represented by its most cited member.
+    Returns False, leaving the index unchanged, when new references link older
+    references of different clusters, since that changes their canonical ids.
+    """
+    keys = index.keys
+    new = np.array([i for i in range(first_new, len(keys)) if not keys[i].startswith("doi:")], dtype=np.int64)
+    if len(new) == 0:
+        return True
+    new_blocks = {block for i in new for block in block_keys(clean_text(keys[i]))}
+    older = np.array([i for i in range(first_new) if not keys[i].startswith("doi:")
+                      and not new_blocks.isdisjoint(block_keys(clean_text(keys[i])))], dtype=np.int64)
+    candidates = np.concatenate([older, new])
+    roots = cluster_labels(len(candidates), find_duplicates([keys[i] for i in candidates], threshold, num_perm,
+                                                            bands, seed))
+
+    citations = np.bincount(index.indices, minlength=len(keys))
+    canonical = index.canonical.copy()
+    order = np.argsort(roots, kind="stable")
+    boundaries = np.flatnonzero(np.diff(roots[order])) + 1
+    for cluster in np.split(order, boundaries):
+        members = candidates[cluster]
+        added = members[members >= first_new]
+        if len(cluster) == 1 or len(added) == 0:
+            continue
+        clusters = np.unique(canonical[members[members < first_new]])
+        if len(clusters) > 1:
+            return False
+        canonical[added] = clusters[0] if len(clusters) else added[np.argmax(citations[added])]
+    index.canonical = canonical
+    return True
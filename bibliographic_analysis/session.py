@@ -0,0 +1,74 @@
+import hashlib
+import io
+import os
+
+import streamlit as st
+
+from author_table import load_or_build_author_table
+from corpus import load_corpus
+from reference_index import load_or_build
+
+# Worker processes of the app's parallel analyses, per cache miss; ANALYSIS_WORKERS overrides the default
+WORKERS = max(1, int(os.environ.get("ANALYSIS_WORKERS", "2")))
+
+# Corpus file of each key loaded by path, so its persisted sidecars can be used
+_corpus_paths = {}
+
+
+def corpus_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@st.cache_resource(show_spinner="Loading corpus...", max_entries=4)
+def _load_corpus(key, name, _data):
+    buffer = io.BytesIO(_data)
+    buffer.name = name
+    return load_corpus(buffer)
+
+
+def load_uploaded_corpus(uploaded_file):
+    """
+    Parse an uploaded corpus once per file content and share it across tabs and reruns.
+    Returns (df, key); the key is the content hash that cached analyses are keyed on.
+    The DataFrame is shared, so callers must not modify it in place.
+    """
+    data = uploaded_file.getvalue()
+    key = corpus_key(data)
+    return _load_corpus(key, uploaded_file.name, data), key
+
+
+@st.cache_resource(show_spinner="Loading corpus...", max_entries=4)
+def _load_corpus_file(key, path):
+    return load_corpus(path)
+
+
+def load_corpus_file(path):
+    """
+    Load a corpus written by data_preparation from a path on the server, as load_uploaded_corpus.
+    The key changes whenever the file does, and the index and author table
+    persisted next to it are loaded instead of rebuilt while they are fresh.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = corpus_key(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    _corpus_paths[key] = path
+    return _load_corpus_file(key, path), key
+
+
+@st.cache_resource(show_spinner="Indexing references...", max_entries=4)
+def reference_index(key, _df):
+    """
+    Reference index of the corpus with this key, built once and shared by all tabs.
+    Near-duplicate references are merged so each cited work is counted once.
+    A corpus loaded by path uses the .refindex.npz persisted next to it when fresh.
+    """
+    return load_or_build(_df, _corpus_paths.get(key))
+
+
+@st.cache_resource(show_spinner="Indexing authors...", max_entries=4)
+def author_table(key, _df):
+    """
+    Long (article, author) table of the corpus with this key, built once and shared by all author metrics.
+    A corpus loaded by path uses the .authors.parquet written next to it by to_corpus when fresh.
+    """
+    return load_or_build_author_table(_df, _corpus_paths.get(key))
@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from centrality import adjacency
+from citation_matrices import co_citation_matrix, coupling_matrix
+from clustering import DEFAULT_RESOLUTION, DEFAULT_SEED, louvain, modularity
+
+DEFAULT_WIDTH = 5
+DEFAULT_STEP = 5
+MIN_CLUSTER_SIZE = 5
+MIN_OVERLAP = 0.3
+EVENTS = ("continue", "split", "merge", "split and merge", "emerge", "dissolve")
+
+# Incidence matrix of the whole corpus shared with the window worker processes, set once per worker
+_worker_incidence = None
+
+
+def publication_years(years):
+    """Years as floats, NaN where missing or not a number."""
+    return pd.to_numeric(pd.Series(years), errors="coerce").to_numpy(dtype=float)
+
+
+def year_windows(years, width=DEFAULT_WIDTH, step=DEFAULT_STEP):
+    """
+    (first, last) year of windows of width years starting every step years,
+    from the earliest known year until the latest one is covered. step < width
+    gives sliding, overlapping windows.
+    """
+    if width < 1 or step < 1:
+        raise ValueError("width and step must be at least one year")
+    years = years[~np.isnan(years)]
+    if len(years) == 0:
+        return []
+    start, last = int(years.min()), int(years.max())
+    windows = [(start, start + width - 1)]
+    while windows[-1][1] < last:
+        start += step
+        windows.append((start, start + width - 1))
+    return windows
+
+
+def _membership(nodes, communities, n_columns, min_size):
+    """Clusters x columns 0/1 CSR of the communities (numbered by decreasing size) with at least min_size nodes."""
+    kept = int((np.bincount(communities) >= min_size).sum()) if len(communities) else 0
+    mask = communities < kept
+    return sparse.csr_matrix((np.ones(mask.sum()), (communities[mask], nodes[mask])), shape=(kept, n_columns))
+
+
+def _window(A, rows, normalization=None, resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED,
+            min_size=MIN_CLUSTER_SIZE):
+    """
+    Co-citation and coupling clusters of the articles rows of the incidence A.
+    Each graph gives (nodes, community from 1, weighted degree, modularity) and
+    the clusters x references matrix of its clusters of min_size nodes or more;
+    a coupling cluster is represented by the references its articles cite.
+    """
+    A_w = A[rows]
+    W, references = adjacency(co_citation_matrix(A_w))
+    co_citation = louvain(W, resolution, seed)
+    W_bc, articles = adjacency(coupling_matrix(A_w, normalization=normalization))
+    coupling = louvain(W_bc, resolution, seed)
+
+    cited = _membership(articles, coupling, len(rows), min_size) @ A_w
+    cited.data[:] = 1
+    return {
+        "articles": len(rows),
+        "references": int((A_w.getnnz(axis=0) > 0).sum()),
+        "co_citation": (references, co_citation + 1, np.asarray(W.sum(axis=1)).ravel(), modularity(W, co_citation)),
+        "coupling": (rows[articles], coupling + 1, np.asarray(W_bc.sum(axis=1)).ravel(), modularity(W_bc, coupling)),
+        "co_citation_members": _membership(references, co_citation, A.shape[1], min_size),
+        "coupling_members": sparse.csr_matrix(cited),
+    }
+
+
+def _init_worker(A):
+    global _worker_incidence
+    _worker_incidence = A
+
+
+def _window_worker(rows, normalization, resolution, seed, min_size):
+    return _window(_worker_incidence, rows, normalization, resolution, seed, min_size)
+
+
+def window_clusters(index, years, width=DEFAULT_WIDTH, step=DEFAULT_STEP, normalization=None,
+                    resolution=DEFAULT_RESOLUTION, seed=DEFAULT_SEED, min_size=MIN_CLUSTER_SIZE, workers=1):
+    """
+    Co-citation and coupling clusters of every year window of the corpus (see
+    _window). The incidence matrix is built once from the shared reference
+    index and every window is a row slice of it, so no window parses or
+    interns references again; with workers > 1 the windows run in a process
+    pool. Returns (windows, results), results aligned with windows.
+    """
+    years = publication_years(years)
+    A = index.incidence()
+    windows = year_windows(years, width, step)
+    tasks = [(np.flatnonzero((years >= first) & (years <= last)), normalization, resolution, seed, min_size)
+             for first, last in windows]
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(A,)) as executor:
+            results = list(executor.map(_window_worker, *zip(*tasks)))
+    else:
+        results = [_window(A, *task) for task in tasks]
+    return windows, results
+
+
+def cluster_evolution(before, after, min_overlap=MIN_OVERLAP):
+    """
+    Links between the clusters of two consecutive windows, given as clusters x
+    references 0/1 matrices. Two clusters are linked when their inclusion index
+    |A ∩ B| / min(|A|, |B|) reaches min_overlap. A cluster linked to several
+    later clusters splits, several clusters linked to one later cluster merge,
+    a later cluster without links emerges and an earlier one dissolves.
+    Returns rows (cluster before, cluster after, overlap, event), clusters numbered from 1.
+    """
+    shared = (before @ after.T).toarray()
+    smaller = np.minimum.outer(before.getnnz(axis=1), after.getnnz(axis=1))
+    overlap = np.divide(shared, smaller, out=np.zeros(shared.shape), where=smaller > 0)
+    links = overlap >= min_overlap
+    splits, merges = links.sum(axis=1) > 1, links.sum(axis=0) > 1
+
+    rows = []
+    for i, j in zip(*np.nonzero(links)):
+        event = EVENTS[1 * splits[i] + 2 * merges[j]]
+        rows.append((i + 1, j + 1, float(overlap[i, j]), event))
+    rows += [(None, j + 1, 0.0, "emerge") for j in np.flatnonzero(~links.any(axis=0))]
+    rows += [(i + 1, None, 0.0, "dissolve") for i in np.flatnonzero(~links.any(axis=1))]
+    return rows
@@ -0,0 +1,115 @@
+# add_nodes / add_edges against pyvis's own Network.add_node / add_edge.
+# Usage: python -m pytest test_graph_export.py
+
+import unittest
+
+import networkx as nx
+import numpy as np
+import pyvis
+from pyvis.network import Network
+
+from graph_export import PYVIS_VERSION, add_edges, add_nodes, centrality_attributes, static_network
+
+
+def network(**options):
+    return Network(height="600px", width="100%", notebook=False, **options)
+
+
+class AddNodesTest(unittest.TestCase):
+
+    def assertSameNetwork(self, expected, actual):
+        self.assertEqual(expected.nodes, actual.nodes)
+        self.assertEqual(expected.node_ids, actual.node_ids)
+        self.assertEqual(expected.node_map, actual.node_map)
+        self.assertEqual(expected.edges, actual.edges)
+
+    def test_pyvis_version(self):
+        self.assertEqual(pyvis.__version__, PYVIS_VERSION)
+
+    def test_nodes_with_attributes(self):
+        nodes = ["a", "b", 3, "a"]
+        sizes = np.array([1.5, 2.0, 3.0, 4.0])
+        expected, actual = network(font_color="black"), network(font_color="black")
+        for node, size, label in zip(nodes, sizes, ["A", "", None, "again"]):
+            expected.add_node(node, label=label, size=float(size), title=f"Node {node}", physics=False)
+        add_nodes(actual, nodes, label=["A", "", None, "again"], size=sizes, title=[f"Node {node}" for node in nodes],
+                  physics=False)
+        self.assertSameNetwork(expected, actual)
+
+    def test_scalar_and_numpy_values(self):
+        expected, actual = network(), network()
+        for node, x in zip([1, 2], [10, 20]):
+            expected.add_node(node, shape="box", color="red", x=x, borderWidth=2)
+        add_nodes(actual, np.array([1, 2]), shape="box", color="red", x=np.array([10, 20]), borderWidth=np.int64(2))
+        self.assertSameNetwork(expected, actual)
+        self.assertIs(type(actual.nodes[0]["id"]), int)
+
+    def test_group_replaces_color(self):
+        expected, actual = network(), network()
+        for node, group in (("a", 1), ("b", 2)):
+            expected.add_node(node, group=group)
+        add_nodes(actual, ["a", "b"], group=[1, 2])
+        self.assertSameNetwork(expected, actual)
+
+    def test_misaligned_attribute(self):
+        with self.assertRaises(ValueError):
+            add_nodes(network(), ["a", "b"], size=[1])
+
+
+class AddEdgesTest(unittest.TestCase):
+
+    def test_undirected_pairs_are_added_once(self):
+        pairs = [("a", "b"), ("b", "c"), ("b", "a"), ("a", "b")]
+        expected, actual = network(), network()
+        for net in (expected, actual):
+            add_nodes(net, ["a", "b", "c"])
+        for (source, target), weight in zip(pairs, [1, 2, 3, 4]):
+            expected.add_edge(source, target, value=weight)
+        add_edges(actual, *zip(*pairs), value=np.array([1, 2, 3, 4]))
+        self.assertEqual(expected.edges, actual.edges)
+
+    def test_directed_edges(self):
+        pairs = [("a", "b"), ("b", "a"), ("a", "b")]
+        expected, actual = network(directed=True), network(directed=True)
+        for net in (expected, actual):
+            add_nodes(net, ["a", "b"])
+        for source, target in pairs:
+            expected.add_edge(source, target, title="edge")
+        add_edges(actual, *zip(*pairs), title="edge")
+        self.assertEqual(expected.edges, actual.edges)
+
+    def test_missing_node(self):
+        net = network()
+        add_nodes(net, ["a"])
+        with self.assertRaises(ValueError):
+            add_edges(net, ["a"], ["b"])
+
+
+class StaticNetworkTest(unittest.TestCase):
+
+    def test_centrality_graph(self):
+        """static_network gives the network the centrality tab built node by node."""
+        rng = np.random.default_rng(0)
+        G = nx.relabel_nodes(nx.gnm_random_graph(60, 180, seed=0), lambda node: f"Reference {node}")
+        nx.set_edge_attributes(G, {edge: int(w) for edge, w in zip(G.edges(), rng.integers(1, 10, 180))}, "weight")
+        positions = {node: tuple(rng.random(2) * 1000) for node in G}
+        betweenness, eigenvector, closeness = (dict(zip(G, rng.random(60))) for _ in range(3))
+        attributes = centrality_attributes(G.nodes(), betweenness, eigenvector, closeness, "Eigenvector")
+
+        expected = network(bgcolor="#ffffff", font_color="black")
+        expected.toggle_physics(False)
+        for i, node in enumerate(G.nodes()):
+            expected.add_node(node, label=node, size=15 + eigenvector[node] * 50, color=str(attributes["color"][i]),
+                              borderWidth=int(attributes["borderWidth"][i]), x=positions[node][0],
+                              y=positions[node][1], physics=False, title=attributes["title"][i])
+        for u, v, weight in G.edges(data="weight"):
+            expected.add_edge(u, v, value=weight)
+
+        actual = static_network(G, G.nodes(), positions, **attributes)
+        self.assertEqual(expected.nodes, actual.nodes)
+        self.assertEqual(expected.edges, actual.edges)
+        self.assertEqual(expected.options.to_json(), actual.options.to_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
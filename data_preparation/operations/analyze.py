@@ -0,0 +1,183 @@
+# Headless analysis of a corpus: runs the selected analyses of the app without
+# any UI and writes every table they produce as csv or parquet.
+# Usage: python analyze.py <corpus file> [--analyses performance co_citation ...]
+#                          [--models_file <models sheet>] [--format csv|parquet] [--workers n] [--incremental]
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+from file_manager import ANALYSIS_DIR, OUTPUT_DIR, write_table
+
+if ANALYSIS_DIR not in sys.path:
+    sys.path.append(ANALYSIS_DIR)
+
+import analyses
+from author_table import load_or_build_author_table
+from centrality import MODES
+from clustering import DEFAULT_RESOLUTION, DEFAULT_SEED
+from corpus import load_corpus
+from graph_layout import lod_html
+from incremental import load_or_update, record_keys
+from reference_index import load_or_build
+from temporal import DEFAULT_STEP, DEFAULT_WIDTH, MIN_OVERLAP
+
+ANALYSES = ("performance", "co_citation", "coupling", "centrality", "temporal", "models")
+INDEX_ANALYSES = ("co_citation", "coupling", "centrality", "temporal")
+
+# Inputs shared with the worker processes, set once per worker
+_corpus = None
+_index = None
+_authors = None
+_models = None
+_state = None
+
+
+def _init_worker(df, index, authors, models, state=None):
+    global _corpus, _index, _authors, _models, _state
+    _corpus, _index, _authors, _models, _state = df, index, authors, models, state
+
+
+def pair_counts(name, strength):
+    """Co-citation or coupling counts kept by the incremental state, None without one."""
+    if _state is None:
+        return None
+    if name == "co_citation":
+        return _state.co_citation
+    return _state.coupling_matrix(analyses.COUPLING_STRENGTHS[strength])
+
+
+def write_outputs(tables, output_dir, format):
+    """Write each table as <output_dir>/<name>.<format>; returns the paths written."""
+    paths = []
+    for name, table in tables.items():
+        if format == "parquet":
+            # Object columns may mix numbers and text (e.g. years with 'Unknown')
+            table = table.astype({column: "string" for column in table.columns if table[column].dtype == object})
+        path = os.path.join(output_dir, f"{name}.{format}")
+        write_table(table, path)
+        paths.append(path)
+    return paths
+
+
+def write_graph(graph, output_dir, name):
+    """Write a level-of-detail graph as <name>.json and as the standalone page <name>.html."""
+    paths = [os.path.join(output_dir, f"{name}.json"), os.path.join(output_dir, f"{name}.html")]
+    with open(paths[0], "w", encoding="utf-8") as f:
+        json.dump(graph, f)
+    with open(paths[1], "w", encoding="utf-8") as f:
+        f.write(lod_html(graph))
+    return paths
+
+
+def run_analysis(name, output_dir, format, options):
+    start = time.perf_counter()
+    strength = options["coupling_strength"]
+    if name == "performance":
+        tables = analyses.performance_tables(_corpus, _authors, _state.tables if _state is not None else None)
+    elif name == "co_citation":
+        tables = analyses.co_citation_tables(_corpus, _index, counts=pair_counts(name, strength),
+                                             **options["clustering"])
+    elif name == "coupling":
+        tables = analyses.coupling_tables(_corpus, _index, strength, counts=pair_counts(name, strength),
+                                          **options["clustering"])
+    elif name == "centrality":
+        tables = analyses.centrality_tables(_corpus, _index, options["centrality_mode"], options["centrality_workers"])
+    elif name == "temporal":
+        clustering = options["clustering"]
+        tables = analyses.temporal_tables(_corpus, _index, strength=strength,
+                                          resolution=clustering["resolution"], seed=clustering["seed"],
+                                          **options["temporal"])
+    else:
+        tables = analyses.model_tables(*analyses.parse_models(_models))
+    paths = write_outputs(tables, output_dir, format)
+
+    if options["graphs"] and name in ("co_citation", "coupling"):
+        clustering = options["clustering"]
+        if name == "co_citation":
+            M, labels = analyses.co_citation_pairs(_index, pair_counts(name, strength))
+        else:
+            M, labels = analyses.coupling_pairs(_index, _corpus['Title'], strength, pair_counts(name, strength))
+        graph = analyses.full_graph_lod(M, labels, clustering["resolution"], clustering["seed"])
+        paths += write_graph(graph, output_dir, f"{name}_graph")
+    return paths, time.perf_counter() - start
+
+
+def report(name, run):
+    try:
+        paths, seconds = run()
+        print(f"{name}: {len(paths)} files written in {seconds:.1f}s")
+    except Exception as e:
+        print(f"Error During {name}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the analyses of the app on a corpus and write their tables.")
+    parser.add_argument('input_file', help='Path to the corpus file')
+    parser.add_argument('--analyses', nargs='+', choices=ANALYSES, help='Analyses to run (default: all that have their input)')
+    parser.add_argument('--models_file', help='Sheet of article titles and models (status, data columns) for the models analysis')
+    parser.add_argument('--output_dir', help='Directory of the output tables (default: <outputs>/<corpus name>_analysis)')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='Format of the output tables')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of analyses run in parallel')
+    parser.add_argument('--coupling_strength', choices=list(analyses.COUPLING_STRENGTHS), default='Shared_Refs', help='Strength of the bibliographic coupling')
+    parser.add_argument('--resolution', type=float, default=DEFAULT_RESOLUTION, help='Louvain resolution of the clusters; higher gives more, smaller clusters')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed of the Louvain node order')
+    parser.add_argument('--full_graph', action='store_true', help='Cluster the whole co-citation and coupling graphs instead of only their top pairs')
+    parser.add_argument('--graphs', action='store_true', help='Also write the full co-citation and coupling graphs, laid out with clusters as super-nodes, as JSON and HTML')
+    parser.add_argument('--window_width', type=int, default=DEFAULT_WIDTH, help='Years per window of the temporal analysis')
+    parser.add_argument('--window_step', type=int, default=DEFAULT_STEP, help='Years between the starts of consecutive windows; less than the width gives sliding windows')
+    parser.add_argument('--min_overlap', type=float, default=MIN_OVERLAP, help='Inclusion index above which clusters of consecutive windows are linked')
+    parser.add_argument('--window_workers', type=int, default=1, help='Processes of the temporal analysis itself, one window each')
+    parser.add_argument('--centrality_mode', choices=MODES, default='approximate', help='Exact or sampled-pivot betweenness and closeness')
+    parser.add_argument('--centrality_workers', type=int, default=1, help='Processes of the centrality analysis itself')
+    parser.add_argument('--incremental', action='store_true', help='Update the analysis state persisted next to the corpus with the changed records and write the outputs from it')
+    args = parser.parse_args()
+
+    selected = args.analyses or [name for name in ANALYSES if name != "models" or args.models_file]
+    if "models" in selected and not args.models_file:
+        parser.error("the models analysis needs --models_file")
+    output_dir = args.output_dir or os.path.join(OUTPUT_DIR, os.path.splitext(os.path.basename(args.input_file))[0] + "_analysis")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # --- Shared inputs: corpus, author table and reference index, loaded or built once ---
+    print(f"Loading {args.input_file}...")
+    df = load_corpus(args.input_file)
+    state = None
+    if args.incremental:
+        # --- Incremental: the persisted state brought up to date, corpus rows reordered to the state's ---
+        state, summary = load_or_update(df, args.input_file)
+        print(f"State: {summary['added']} records added or changed, {summary['removed']} removed"
+              f"{' (full rebuild)' if summary['rebuilt'] else ''}")
+        position = dict(zip(record_keys(df), range(len(df))))
+        df = df.iloc[[position[key] for key in state.records['key']]].reset_index(drop=True)
+        authors, index = state.authors, state.index
+    else:
+        authors = load_or_build_author_table(df, args.input_file) if "performance" in selected else None
+        index = load_or_build(df, args.input_file) if set(selected) & set(INDEX_ANALYSES) else None
+    models = load_corpus(args.models_file) if "models" in selected else None
+
+    options = {"coupling_strength": args.coupling_strength, "centrality_mode": args.centrality_mode,
+               "centrality_workers": args.centrality_workers, "graphs": args.graphs,
+               "clustering": {"resolution": args.resolution, "seed": args.seed, "full_graph": args.full_graph},
+               "temporal": {"width": args.window_width, "step": args.window_step, "min_overlap": args.min_overlap,
+                            "workers": args.window_workers}}
+    workers = min(args.workers, len(selected))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(df, index, authors, models, state)) as executor:
+            futures = {executor.submit(run_analysis, name, output_dir, args.format, options): name for name in selected}
+            for future in as_completed(futures):
+                report(futures[future], future.result)
+    else:
+        _init_worker(df, index, authors, models, state)
+        for name in selected:
+            report(name, partial(run_analysis, name, output_dir, args.format, options))
+    print("Outputs written to", output_dir)
+
+
+if __name__ == "__main__":
+    main()
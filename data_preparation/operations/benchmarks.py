@@ -0,0 +1,65 @@
+# Throughput benchmarks for the data preparation operations.
+# Usage: python benchmarks.py [number_of_records]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from wos_format import iter_wos_records, wos_to_excel
+
+WORDS = ["process", "performance", "indicator", "management", "business", "model", "measurement", "analysis"]
+
+
+def write_sample_wos(path, records, seed=0):
+    """Write a synthetic WoS plain-text export with multi-line AU, TI, AB and CR fields."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("FN Clarivate Analytics Web of Science\nVR 1.0\n")
+        for i in range(records):
+            authors = [f"Author{rng.randrange(5000)}, {chr(65 + rng.randrange(26))}" for _ in range(rng.randint(1, 6))]
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+            abstract = " ".join(rng.choice(WORDS) for _ in range(200))
+            references = [f"Author{rng.randrange(5000)} A, {rng.randint(1980, 2024)}, J{rng.randrange(300)}, V{rng.randrange(50)}, P{rng.randrange(900)}"
+                          for _ in range(rng.randint(10, 60))]
+            f.write("PT J\n")
+            f.write("AU " + "\n   ".join(authors) + "\n")
+            f.write("TI " + title[:70] + "\n   " + title[70:] + "\n")
+            f.write("SO JOURNAL " + str(rng.randrange(300)) + "\n")
+            f.write("LA English\n")
+            f.write("AB " + abstract + "\n")
+            f.write("CR " + "\n   ".join(references) + "\n")
+            f.write(f"TC {rng.randrange(500)}\n")
+            f.write(f"PY {rng.randint(1990, 2024)}\n")
+            f.write(f"DI 10.{1000 + rng.randrange(9000)}/sample.{i}\n")
+            f.write("ER\n\n")
+        f.write("EF\n")
+
+
+def benchmark_wos_ingest(records=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "sample.txt")
+        write_sample_wos(input_path, records)
+        size_mb = os.path.getsize(input_path) / 1024 / 1024
+        print(f"WoS ingest: {records} records, {size_mb:.1f} MB")
+
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_wos_records(input_path))
+        elapsed = time.perf_counter() - start
+        print(f"  parse only: {count / elapsed:,.0f} records/s")
+
+        for extension in (".csv", ".parquet", ".xlsx"):
+            output_path = os.path.join(directory, "sample" + extension)
+            start = time.perf_counter()
+            try:
+                count = wos_to_excel(input_path, output_path)
+            except ImportError as e:
+                print(f"  {extension}: skipped ({e})")
+                continue
+            elapsed = time.perf_counter() - start
+            print(f"  to {extension}: {count / elapsed:,.0f} records/s")
+
+
+if __name__ == "__main__":
+    benchmark_wos_ingest(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
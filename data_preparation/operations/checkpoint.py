@@ -0,0 +1,58 @@
+import json
+import os
+
+import pandas as pd
+
+
+def row_key(row):
+    """Stable key of an input row: its DOI, or its title when the DOI is missing."""
+    for column, prefix in (("DOI", "doi"), ("Title", "title")):
+        value = row.get(column)
+        if not pd.isna(value) and str(value).strip() != '':
+            return f"{prefix}:{str(value).strip()}"
+    return f"row:{row.name}"
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL log of (row key, field, value) for every lookup made
+    during an enrichment run. Each line is flushed as soon as it is written,
+    so an interrupted run can be resumed without repeating its requests.
+    A value of null records a lookup that found nothing.
+    """
+
+    def __init__(self, path, resume=False):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.done = {}
+        if resume and os.path.exists(path):
+            self._load()
+        self.file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Last line of a run that was killed while writing
+                    continue
+                self.done[(entry["key"], entry["field"])] = entry["value"]
+        print(f"Resuming from {self.path}: {len(self.done)} lookups already done")
+
+    def is_done(self, key, field):
+        return (key, field) in self.done
+
+    def record(self, key, field, value):
+        self.done[(key, field)] = value
+        self.file.write(json.dumps({"key": key, "field": field, "value": value}, ensure_ascii=False, default=str) + "\n")
+        self.file.flush()
+
+    def values(self, field):
+        """Return {row key: value} of the lookups that found a value for field."""
+        return {key: value for (key, done_field), value in self.done.items() if done_field == field and value is not None}
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_MB = 512
+
+MISSING = object()
+
+
+class CrossrefCache:
+    """
+    On-disk cache of Crossref work records, stored zlib-compressed in SQLite.
+    Entries are content-addressed by the normalized DOI or title query, expire
+    after `ttl` seconds (None keeps them forever) and the least recently read
+    entries are evicted once the payloads exceed `max_size` bytes.
+    A lookup that found nothing is cached too, so it is not requested again.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL_DAYS * 86400, max_size=DEFAULT_MAX_MB * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS works ("
+            "key TEXT PRIMARY KEY, payload BLOB, size INTEGER, fetched_at REAL, accessed_at REAL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS works_accessed_at ON works (accessed_at)")
+        self.connection.commit()
+        self.total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM works").fetchone()[0]
+
+    @staticmethod
+    def make_key(kind, search_term):
+        term = " ".join(str(search_term).split()).casefold()
+        return hashlib.sha256(f"{kind}:{term}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached work (None for a cached miss), or MISSING."""
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT payload, size, fetched_at FROM works WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return MISSING
+            payload, size, fetched_at = row
+            if self.ttl is not None and now - fetched_at > self.ttl:
+                self.connection.execute("DELETE FROM works WHERE key = ?", (key,))
+                self.connection.commit()
+                self.total_size -= size
+                return MISSING
+            self.connection.execute("UPDATE works SET accessed_at = ? WHERE key = ?", (now, key))
+            self.connection.commit()
+        return json.loads(zlib.decompress(payload))
+
+    def put(self, key, work):
+        payload = zlib.compress(json.dumps(work, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self.lock:
+            previous = self.connection.execute("SELECT size FROM works WHERE key = ?", (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO works (key, payload, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self.total_size += len(payload) - (previous[0] if previous else 0)
+            if self.total_size > self.max_size:
+                self._evict()
+            self.connection.commit()
+
+    def _evict(self):
+        # Drop least recently read entries until the cache is back under 90% of its cap
+        target = self.max_size * 0.9
+        rows = self.connection.execute("SELECT key, size FROM works ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self.total_size <= target:
+                break
+            evicted.append((key,))
+            self.total_size -= size
+        self.connection.executemany("DELETE FROM works WHERE key = ?", evicted)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from crossref_cache import MISSING
+
+CROSSREF_API_URL = "https://api.crossref.org"
+USER_AGENT = "biliographic-analysis-on-indicators"
+
+# Crossref polite pool: identify yourself with a mailto, keep a small number of
+# concurrent connections and stay under the advertised X-Rate-Limit headers.
+DEFAULT_WORKERS = 3
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_TIMEOUT = 10
+# DOIs per filter=doi:... query, small enough to keep the URL short
+DEFAULT_DOI_BATCH = 20
+
+DOI_PATTERN = re.compile(r"^10\.\d{4,9}/\S+$")
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
+
+
+def normalize_doi(search_term):
+    term = str(search_term).strip()
+    for prefix in DOI_PREFIXES:
+        if term.lower().startswith(prefix):
+            return term[len(prefix):]
+    return term
+
+
+def is_doi(search_term):
+    return bool(DOI_PATTERN.match(normalize_doi(search_term)))
+
+
+class RateLimiter:
+    """Spaces request start times so that at most `rate` requests begin per second."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.rate = rate
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class CrossrefClient:
+    """
+    Pooled Crossref client shared by every lookup of a run.
+    All workers reuse one requests.Session, so connections are kept alive
+    instead of being opened for every record. With a CrossrefCache, records
+    are read from disk first; in offline mode the network is never used.
+    """
+
+    def __init__(self, mailto=None, max_workers=DEFAULT_WORKERS, rate_limit=DEFAULT_RATE_LIMIT,
+                 timeout=DEFAULT_TIMEOUT, base_url=CROSSREF_API_URL, cache=None, offline=False):
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.offline = offline
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_limit)
+
+        retry = Retry(total=5, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = f"{USER_AGENT} (mailto:{mailto})" if mailto else USER_AGENT
+        self.params = {"mailto": mailto} if mailto else {}
+
+    def _follow_rate_limit_headers(self, headers):
+        limit = headers.get("X-Rate-Limit-Limit")
+        interval = headers.get("X-Rate-Limit-Interval")
+        if not limit or not interval:
+            return
+        try:
+            rate = int(limit) / float(interval.rstrip("s"))
+        except ValueError:
+            return
+        self.limiter.set_rate(min(self.rate_limit, rate))
+
+    def _get(self, path, params=None):
+        self.limiter.wait()
+        response = self.session.get(self.base_url + path, params={**self.params, **(params or {})},
+                                    timeout=self.timeout)
+        self._follow_rate_limit_headers(response.headers)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()["message"]
+
+    def _request_work(self, search_term):
+        if is_doi(search_term):
+            return self._get("/works/" + quote(normalize_doi(search_term), safe="/"))
+        message = self._get("/works", {"query.bibliographic": str(search_term), "rows": 1})
+        items = message.get("items") if message else None
+        return items[0] if items else None
+
+    def get_work(self, search_term):
+        """Return the work record for a DOI, or the best bibliographic match for a title."""
+        if self.cache is None:
+            return None if self.offline else self._request_work(search_term)
+
+        if is_doi(search_term):
+            key = self.cache.make_key("doi", normalize_doi(search_term))
+        else:
+            key = self.cache.make_key("query", search_term)
+        work = self.cache.get(key)
+        if work is not MISSING:
+            return work
+        if self.offline:
+            return None
+        work = self._request_work(search_term)
+        self.cache.put(key, work)
+        return work
+
+    def _request_doi_batch(self, dois):
+        message = self._get("/works", {"filter": ",".join(f"doi:{doi}" for doi in dois), "rows": len(dois)})
+        works = dict.fromkeys(dois)
+        for item in (message or {}).get("items", []):
+            works[item["DOI"].lower()] = item
+        return works
+
+    def _doi_batch_or_empty(self, dois):
+        try:
+            return self._request_doi_batch(dois)
+        except requests.RequestException as e:
+            print(f"Request failed for batch of {len(dois)} DOIs\nError: {e}")
+            return {}
+
+    def fetch_works_by_doi(self, dois, batch_size=DEFAULT_DOI_BATCH):
+        """
+        Resolve many DOIs with concurrent multi-DOI filter queries.
+        Returns {lowercase DOI: work}, with None for DOIs Crossref does not know.
+        DOIs whose batch failed are left out so the caller can retry them one by one.
+        """
+        works = {}
+        pending = []
+        for doi in dict.fromkeys(normalize_doi(doi).lower() for doi in dois):
+            if self.cache is not None:
+                work = self.cache.get(self.cache.make_key("doi", doi))
+                if work is not MISSING:
+                    works[doi] = work
+                    continue
+            # Commas would split the filter value
+            if not self.offline and "," not in doi:
+                pending.append(doi)
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_works in executor.map(self._doi_batch_or_empty, batches):
+                works.update(batch_works)
+                if self.cache is not None:
+                    for doi, work in batch_works.items():
+                        self.cache.put(self.cache.make_key("doi", doi), work)
+        return works
+
+    def _get_work_or_none(self, search_term):
+        try:
+            return self.get_work(search_term)
+        except requests.RequestException as e:
+            print(f"Request failed for search of: {search_term}\nError: {e}")
+            return None
+
+    def fetch_works(self, search_terms):
+        """
+        Fetch every search term concurrently (duplicates are requested once).
+        Yields (search_term, work) pairs as soon as each request finishes;
+        work is None when the lookup failed or found nothing.
+        """
+        terms = list(dict.fromkeys(search_terms))
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {executor.submit(self._get_work_or_none, term): term for term in terms}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
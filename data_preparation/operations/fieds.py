@@ -26,4 +26,30 @@ CROSSREF_AVAILABLE_FIELDS = {
     'DOI': 'DOI'
 }
 
-REFERENCE_FIELDS = ["DOI", "article-title", "author"]
\ No newline at end of file
+REFERENCE_FIELDS = ["DOI", "article-title", "author"]
+
+# Tags whose continuation lines are separate values rather than wrapped text,
+# and the separator used to join them into a single cell
+WOS_MULTIVALUE_FIELDS = {
+    'AU': ',',
+    'C1': '; ',
+    'CR': '; ',
+}
+
+WOS_NUMERIC_FIELDS = ['TC', 'PY']
+
+# Other column names used for WoS fields in exported tables (e.g. data/allMetadata.xlsx)
+WOS_COLUMN_ALIASES = {
+    'PT': ['Document type'],
+    'PY': ['Publication year'],
+    'CR': ['Article References'],
+}
+
+# Canonical corpus columns used by the analysis app, for tables built from WoS tags
+CORPUS_COLUMN_NAMES = {
+    'Publication Year': 'Publication year',
+    'Cited References': 'Article References',
+    'Document Type': 'Document type',
+}
+
+CORPUS_NUMERIC_COLUMNS = ['Times Cited', 'Publication year', 'Volume', 'Issue']
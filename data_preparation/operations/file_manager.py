@@ -1,7 +1,13 @@
 import os
 
+import pandas as pd
+from fieds import CORPUS_COLUMN_NAMES as corpus_column_names
+from fieds import CORPUS_NUMERIC_COLUMNS as corpus_numeric_columns
+
 OUTPUT_DIR = "biliographic_analysis_on_indicators/data_preparation/outputs"
 OUTPUT_PREFIX = "output_"
+CACHE_PATH = os.path.join(OUTPUT_DIR, "crossref_cache.sqlite")
+ANALYSIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "bibliographic_analysis")
 
 def get_next_output_filename(format):
     if not os.path.exists(OUTPUT_DIR):
@@ -19,4 +25,50 @@ def get_next_output_filename(format):
             continue
 
     next_num = max(existing_nums, default=0) + 1
-    return os.path.join(OUTPUT_DIR, f"{OUTPUT_PREFIX}{next_num}{format}")
\ No newline at end of file
+    return os.path.join(OUTPUT_DIR, f"{OUTPUT_PREFIX}{next_num}{format}")
+
+def get_checkpoint_filename(input_path):
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(OUTPUT_DIR, f"{name}.checkpoint.jsonl")
+
+
+def read_table(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        return pd.read_parquet(path)
+    if extension in (".arrow", ".feather"):
+        return pd.read_feather(path)
+    if extension == ".csv":
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+def write_table(df, path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        df.to_parquet(path, index=False)
+    elif extension in (".arrow", ".feather"):
+        df.reset_index(drop=True).to_feather(path)
+    elif extension == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+def prepare_corpus(df):
+    """Give a table the canonical corpus columns and types: numeric columns as numbers, everything else as text."""
+    df = df.rename(columns={name: corpus_name for name, corpus_name in corpus_column_names.items() if corpus_name not in df.columns})
+    for column in df.columns:
+        if column in corpus_numeric_columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+        elif df[column].dtype == object:
+            df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+    return df
+
+def to_corpus(input_path, output_path):
+    df = prepare_corpus(read_table(input_path))
+    write_table(df, output_path)
+    print(f"Corpus with {len(df)} records saved to {output_path}")
+    return df
+
+def write_author_table(table, path):
+    table.to_parquet(path, index=False)
+    print(f"Author table saved to {path}")
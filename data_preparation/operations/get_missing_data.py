@@ -3,15 +3,22 @@ import requests
 from fieds import WOS_FIELDS as fields
 from fieds import CROSSREF_AVAILABLE_FIELDS as crossref_fields
 from fieds import REFERENCE_FIELDS as reference_fields
+from crossref_client import CrossrefClient, normalize_doi
+from crossref_cache import MISSING
+from itertools import islice
+from checkpoint import row_key
+from file_manager import read_table, write_table
 import json
 
-def get_field_from_api(crossref_field, search_term):
-    url = "https://api.crossref.org/works/" + search_term
+DEFAULT_CLIENT = CrossrefClient()
+
+# Number of fetched works whose reference DOIs are resolved together
+REFERENCE_CHUNK = 200
+
+def get_field_from_api(crossref_field, search_term, client=None):
+    client = client or DEFAULT_CLIENT
     try:
-        response = requests.get(url,timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        items = data['message']
+        items = client.get_work(search_term)
         if items:
             
             return items[crossref_field]
@@ -19,6 +26,26 @@ def get_field_from_api(crossref_field, search_term):
         print(f"Request failed for search of: {search_term}\nError: {e}")
         return None        
 
+def get_reference_field(crossref_field, doi, client=None, resolved=None):
+    """Read a field of a referenced work from the batch-resolved records, falling back to a single request."""
+    work = resolved.get(normalize_doi(doi).lower(), MISSING) if resolved is not None else MISSING
+    if work is MISSING:
+        return get_field_from_api(crossref_field, doi, client)
+    if work:
+        return work[crossref_field]
+
+def reference_dois(work, missing_fields):
+    """DOIs of the references of work whose own record is needed to fill missing_fields."""
+    dois = []
+    for reference in work.get("reference") or []:
+        if reference_fields[0] not in reference:
+            continue
+        if ('Article References' in missing_fields and reference_fields[1] not in reference) or \
+                ('Author References' in missing_fields and reference_fields[2] not in reference):
+            dois.append(normalize_doi(reference[reference_fields[0]]).lower())
+    return dois
+
+def parse_author_references(references, article, client=None, resolved=None):
     references_line = ""
 
     for reference in references:
@@ -31,7 +58,7 @@ def get_field_from_api(crossref_field, search_term):
         # Case 2: If field[0] exists, try to fetch authors
         elif reference_fields[0] in reference:
             try:
-                authors = get_field_from_api('author', reference[reference_fields[0]])
+                authors = get_reference_field('author', reference[reference_fields[0]], client, resolved)
                 if authors:
                     reference_text = "".join(
                         f"{author['family']}, {author['given']}; " for author in authors
@@ -41,7 +68,7 @@ def get_field_from_api(crossref_field, search_term):
 
                 # Try with field[1]
                 try:
-                    authors = get_field_from_api('author', reference[reference_fields[1]])
+                    authors = get_field_from_api('author', reference[reference_fields[1]], client)
                     if authors:
                         reference_text = "".join(
                             f"{author['family']}, {author['given']}; " for author in authors
@@ -53,13 +80,13 @@ def get_field_from_api(crossref_field, search_term):
         if reference_text == "":
             error_articles(article, reference)
 
-    # Append whatever was found (may be empty if all failed)
-    references_line += reference_text
+        # Append whatever was found (may be empty if all failed)
+        references_line += reference_text
 
     return references_line
 
 
-def parse_article_references(article, references):
+def parse_article_references(article, references, client=None, resolved=None):
     references_line = ""
     for reference in references:
         reference_text = ""
@@ -67,7 +94,7 @@ def parse_article_references(article, references):
             reference_text = reference[reference_fields[1]] + "; "
         elif reference_fields[0] in reference:
             try:
-                title = get_field_from_api('title', reference[reference_fields[0]])
+                title = get_reference_field('title', reference[reference_fields[0]], client, resolved)
                 if title:
                     reference_text = title[0] + "; "
             except Exception as e:
@@ -84,63 +111,125 @@ def parse_article_references(article, references):
 def parse_year(date):
     return date['date-parts'][0][0]
 
-def parse_field_value(crossref_field, field_value, citation_field, article):
+def parse_field_value(crossref_field, field_value, citation_field, article, client=None, resolved=None):
     if crossref_field == "title":
         field_value = field_value[0]
     if crossref_field == "reference":
         
         if citation_field == 'Article References':
-            field_value = parse_article_references(article, field_value)
+            field_value = parse_article_references(article, field_value, client, resolved)
         elif citation_field == 'Author References':
-            field_value = parse_author_references(field_value, article)
+            field_value = parse_author_references(field_value, article, client, resolved)
     if crossref_field == "created":
         field_value = parse_year(field_value)
     return field_value
 
-def fill_missing_field(excel_path, citation_field, output_path):
+def fill_missing_field(excel_path, citation_field, output_path, client=None, journal=None):
     
-    df = pd.read_excel(excel_path)
+    df = read_table(excel_path)
     try:
-        df = process_each_field(citation_field, df)
+        df = process_each_field(citation_field, df, client, journal)
     except Exception as e:
         print(f"Unexpected error while processing field {citation_field}: {e}")
-    df.to_excel(output_path, index=False)
-    print(f"Output saved to {output_path}")
-
-def fill_missing_fields(excel_path, output_path):
-    df = pd.read_excel(excel_path)
-    for key in crossref_fields:
-        try:
-            df = process_each_field(key, df)
-        except Exception as e:
-            print(f"Unexpected error while processing fields: {e}")
-        df.to_excel(output_path, index=False)
+    finally:
+        write_table(df, output_path)
         print(f"Output saved to {output_path}")
 
-def process_each_field(citation_field, df):
-    
-    crossref_field = crossref_fields[citation_field]
-    for index, citation in df.iterrows():
-        if pd.isna(citation[citation_field]) or str(citation[citation_field]).strip() == '':
-            if crossref_field == "DOI":
-                search_term = citation["Title"]
-            else:
-                search_term = citation['DOI']
-            try:
-                
-                field_value = get_field_from_api(crossref_field, search_term)
-                if field_value:
-                    field_value = parse_field_value(crossref_field, field_value, citation_field, citation["Title"])
-                    df.at[index, citation_field] = field_value
-                    print(f" → Found %s: {field_value}", citation_field)
-                    field_value = None
-            except Exception as e:
-                print(f"Unable to get data from API: {e}")
-            finally:
-                continue
-                
+def fill_missing_fields(excel_path, output_path, client=None, journal=None):
+    df = read_table(excel_path)
+    try:
+        df = process_fields(list(crossref_fields), df, client, journal)
+    except Exception as e:
+        print(f"Unexpected error while processing fields: {e}")
+    finally:
+        write_table(df, output_path)
+        print(f"Output saved to {output_path}")
+
+def is_missing(column):
+    return column.isna() | (column.astype(str).str.strip() == '')
+
+def plan_lookups(citation_fields, df, skip=None):
+    """
+    Work out, per article, every field that is missing and the one search term
+    whose work record can fill all of them: the DOI when known, otherwise the title.
+    Fields for which skip(index, field) is true are left out.
+    Returns {search_term: [(index, [citation_field, ...]), ...]}.
+    """
+    citation_fields = [field for field in citation_fields if field in df.columns]
+    missing = pd.DataFrame({field: is_missing(df[field]) for field in citation_fields}, index=df.index)
+    search_terms = df["DOI"].where(~is_missing(df["DOI"]), df["Title"])
+
+    lookups = {}
+    for index, row in missing[missing.any(axis=1)].iterrows():
+        search_term = search_terms[index]
+        if pd.isna(search_term) or str(search_term).strip() == '':
+            continue
+        missing_fields = [field for field in row.index[row] if not (skip and skip(index, field))]
+        if missing_fields:
+            lookups.setdefault(str(search_term).strip(), []).append((index, missing_fields))
+    return lookups
+
+def write_values(df, citation_field, values):
+    if values:
+        found = pd.Series(values, dtype=object)
+        df[citation_field] = df[citation_field].mask(df.index.isin(found.index), found).infer_objects()
     return df
 
+def process_fields(citation_fields, df, client=None, journal=None):
+    client = client or DEFAULT_CLIENT
+    values = {citation_field: {} for citation_field in citation_fields}
+    skip = None
+    if journal:
+        keys = df.apply(row_key, axis=1)
+        for citation_field in citation_fields:
+            if citation_field in df.columns:
+                found = journal.values(citation_field)
+                missing_keys = keys[is_missing(df[citation_field])]
+                values[citation_field].update({index: found[key] for index, key in missing_keys.items() if key in found})
+        skip = lambda index, field: journal.is_done(keys[index], field)
+
+    lookups = plan_lookups(citation_fields, df, skip)
+    print(f"Looking up {sum(len(rows) for rows in lookups.values())} articles ({len(lookups)} requests)")
+
+    # Referenced works are resolved once for the whole corpus, in batches
+    resolved = {}
+    works = client.fetch_works(lookups)
+    try:
+        for chunk in iter(lambda: list(islice(works, REFERENCE_CHUNK)), []):
+            dois = {doi for search_term, work in chunk if work
+                    for index, missing_fields in lookups[search_term]
+                    for doi in reference_dois(work, missing_fields)}
+            dois -= resolved.keys()
+            if dois:
+                print(f"Resolving {len(dois)} referenced DOIs")
+                resolved.update(client.fetch_works_by_doi(dois))
+
+            for search_term, work in chunk:
+                if not work:
+                    continue
+                for index, missing_fields in lookups[search_term]:
+                    for citation_field in missing_fields:
+                        crossref_field = crossref_fields[citation_field]
+                        try:
+                            field_value = None
+                            if work.get(crossref_field):
+                                field_value = parse_field_value(crossref_field, work[crossref_field], citation_field, df.at[index, "Title"], client, resolved)
+                            if field_value:
+                                values[citation_field][index] = field_value
+                                print(f" → Found {citation_field}: {field_value}")
+                            if journal:
+                                journal.record(keys[index], citation_field, field_value or None)
+                        except Exception as e:
+                            print(f"Unable to get data from API: {e}")
+    finally:
+        # Write back whatever was found, also when the run is interrupted
+        for citation_field, field_values in values.items():
+            df = write_values(df, citation_field, field_values)
+    return df
+
+def process_each_field(citation_field, df, client=None, journal=None):
+    return process_fields([citation_field], df, client, journal)
+
 def error_articles(article_name, reference):
     with open(
         "biliographic_analysis_on_indicators/data_preparation/outputs/error.txt",
@@ -1,13 +1,32 @@
 ##Warning: This script takes a long time!
 
 import argparse
-import argparse
+import sys
 from get_missing_data import fill_missing_field, fill_missing_fields
-from file_manager import get_next_output_filename
+from wos_format import wos_to_excel, excel_to_wos
+from file_manager import get_next_output_filename, get_checkpoint_filename, to_corpus, write_author_table, CACHE_PATH, ANALYSIS_DIR
+from crossref_client import CrossrefClient, DEFAULT_WORKERS, DEFAULT_RATE_LIMIT
+from crossref_cache import CrossrefCache, DEFAULT_TTL_DAYS, DEFAULT_MAX_MB
+from checkpoint import CheckpointJournal
+
+
+def corpus_with_author_table(input_path, output_path):
+    # The author table is read back by the analysis app, which owns its format;
+    # imported here so only to_corpus runs need the bibliographic_analysis modules
+    if ANALYSIS_DIR not in sys.path:
+        sys.path.append(ANALYSIS_DIR)
+    from author_table import author_table_path, build_author_table
+
+    df = to_corpus(input_path, output_path)
+    write_author_table(build_author_table(df), author_table_path(output_path))
+
 
 FUNCTIONS = {
     "fill_missing_field": fill_missing_field,
-    "fill_missing_fields": fill_missing_fields
+    "fill_missing_fields": fill_missing_fields,
+    "wos_to_excel": wos_to_excel,
+    "excel_to_wos": excel_to_wos,
+    "to_corpus": corpus_with_author_table
 }
 
 CROSSREF_AVAILABLE_FIELDS = {
@@ -24,17 +43,40 @@ CROSSREF_AVAILABLE_FIELDS = {
 
 
 
+def build_client(args):
+    cache = None
+    if not args.no_cache:
+        cache = CrossrefCache(args.cache, ttl=args.cache_ttl_days * 86400, max_size=args.cache_max_mb * 1024 * 1024)
+    return CrossrefClient(mailto=args.mailto, max_workers=args.workers, rate_limit=args.rate_limit,
+                          cache=cache, offline=args.offline)
+
 def main():
     parser = argparse.ArgumentParser(description="Run  one of the available operations.")
     subparsers = parser.add_subparsers(dest='function', help="Function to execute")
+    crossref_options = argparse.ArgumentParser(add_help=False)
+    crossref_options.add_argument('--mailto', help='Contact e-mail sent to crossref to use the polite pool')
+    crossref_options.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Number of concurrent crossref requests')
+    crossref_options.add_argument('--rate_limit', type=float, default=DEFAULT_RATE_LIMIT, help='Maximum crossref requests per second')
+    crossref_options.add_argument('--cache', default=CACHE_PATH, help='Path of the crossref response cache')
+    crossref_options.add_argument('--no_cache', action='store_true', help='Do not read or write the crossref response cache')
+    crossref_options.add_argument('--cache_ttl_days', type=float, default=DEFAULT_TTL_DAYS, help='Days before a cached response is fetched again')
+    crossref_options.add_argument('--cache_max_mb', type=float, default=DEFAULT_MAX_MB, help='Size of the cache before the least recently used responses are evicted')
+    crossref_options.add_argument('--offline', action='store_true', help='Only use responses already in the cache')
+    crossref_options.add_argument('--resume', action='store_true', help='Skip the lookups already recorded in the checkpoint of a previous run on the same input file')
     parser_wos_to_excel = subparsers.add_parser('wos_to_excel', help='Convert WoS to Excel')
     parser_wos_to_excel.add_argument('input_file', help='Path to the input file')
+    parser_wos_to_excel.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='Format of the output table')
+    parser_to_corpus = subparsers.add_parser('to_corpus', help='Convert an Excel, csv or WoS-derived table to the columnar corpus used by the analysis app')
+    parser_to_corpus.add_argument('input_file', help='Path to the input file')
+    parser_to_corpus.add_argument('--format', choices=['parquet', 'arrow'], default='parquet', help='Format of the corpus file')
     parser_excel_to_wos = subparsers.add_parser('excel_to_wos', help='Convert Excel to WoS')
     parser_excel_to_wos.add_argument('input_file', help='Path to the input file')
-    fill_missing_fields = subparsers.add_parser('fill_missing_fields', help='Try to fill all of the missing fields using crossref api')
+    fill_missing_fields = subparsers.add_parser('fill_missing_fields', parents=[crossref_options], help='Try to fill all of the missing fields using crossref api')
     fill_missing_fields.add_argument('input_file', help='Path to the input file')
-    parser_fill_missing_field = subparsers.add_parser('fill_missing_field', help='Fill missing fields')
+    fill_missing_fields.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='Format of the output table')
+    parser_fill_missing_field = subparsers.add_parser('fill_missing_field', parents=[crossref_options], help='Fill missing fields')
     parser_fill_missing_field.add_argument('input_file', help='Path to the input file')
+    parser_fill_missing_field.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], default='xlsx', help='Format of the output table')
     parser_fill_missing_field.add_argument('--citation_field', choices=CROSSREF_AVAILABLE_FIELDS.keys(), required=True, help='Citation field that needs to be filled')
     args = parser.parse_args()
     func = FUNCTIONS[args.function]
@@ -42,14 +84,20 @@ def main():
     if(args.function == "excel_to_wos"):
         output_file = get_next_output_filename(".txt")
     else:
-        output_file = get_next_output_filename(".xlsx")
+        output_file = get_next_output_filename("." + args.format)
 
 
     try:
         print(f"Running {args.function} with file {args.input_file}...")
         
         if(func == fill_missing_field):
-            result = func(args.input_file, args.citation_field, output_file)
+            client = build_client(args)
+            journal = CheckpointJournal(get_checkpoint_filename(args.input_file), resume=args.resume)
+            result = func(args.input_file, args.citation_field, output_file, client, journal)
+        elif(func == fill_missing_fields):
+            client = build_client(args)
+            journal = CheckpointJournal(get_checkpoint_filename(args.input_file), resume=args.resume)
+            result = func(args.input_file, output_file, client, journal)
         else:
             result = func(args.input_file, output_file)
         print("Output File Created:", output_file)
@@ -0,0 +1,103 @@
+# Offline tests of CrossrefClient against a local stub of the Crossref API.
+# Usage: python -m pytest test_crossref_client.py
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crossref_cache import MISSING, CrossrefCache
+from crossref_client import CrossrefClient
+
+WORKS = {
+    "10.1234/hit": {"DOI": "10.1234/hit", "title": ["A work that exists"]},
+    "10.1234/busy": {"DOI": "10.1234/busy", "title": ["A work behind a rate limit"]},
+}
+RETRY_AFTER = 1
+
+
+class CrossrefStub(BaseHTTPRequestHandler):
+    """
+    /works/<doi> of WORKS: 200 with the work, 404 for any other DOI. The first
+    request of 10.1234/busy gets a 429 with Retry-After, the next ones the work.
+    """
+
+    def do_GET(self):
+        server = self.server
+        doi = self.path.split("?")[0][len("/works/"):]
+        with server.lock:
+            server.requests.append((time.monotonic(), doi))
+            busy = doi == "10.1234/busy" and sum(seen == doi for _, seen in server.requests) == 1
+        if busy:
+            self.send_response(429)
+            self.send_header("Retry-After", str(RETRY_AFTER))
+            self.end_headers()
+        elif doi in WORKS:
+            body = json.dumps({"status": "ok", "message": WORKS[doi]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-Rate-Limit-Limit", "50")
+            self.send_header("X-Rate-Limit-Interval", "1s")
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CrossrefClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CrossrefStub)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CrossrefCache(os.path.join(self.directory.name, "cache.sqlite"))
+        self.client = CrossrefClient(base_url=f"http://127.0.0.1:{self.server.server_port}", cache=self.cache)
+
+    def tearDown(self):
+        self.client.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_hit(self):
+        self.assertEqual(dict(self.client.fetch_works(["10.1234/hit"])), {"10.1234/hit": WORKS["10.1234/hit"]})
+        # Another form of the same DOI is read from the cache
+        works = dict(self.client.fetch_works(["https://doi.org/10.1234/hit"]))
+        self.assertEqual(works, {"https://doi.org/10.1234/hit": WORKS["10.1234/hit"]})
+        self.assertEqual(len(self.server.requests), 1)
+        # The stub's X-Rate-Limit headers never raise the configured rate
+        self.assertEqual(self.client.limiter.rate, self.client.rate_limit)
+
+    def test_not_found_is_cached_as_missing_work(self):
+        self.assertEqual(dict(self.client.fetch_works(["10.1234/unknown"])), {"10.1234/unknown": None})
+        key = self.cache.make_key("doi", "10.1234/unknown")
+        self.assertIsNone(self.cache.get(key))
+        self.assertIsNot(self.cache.get(key), MISSING)
+        self.assertEqual(dict(self.client.fetch_works(["10.1234/unknown"])), {"10.1234/unknown": None})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_rate_limited_request_is_retried_after_delay(self):
+        waits = []
+        wait = self.client.limiter.wait
+        self.client.limiter.wait = lambda: (waits.append(time.monotonic()), wait())
+
+        works = dict(self.client.fetch_works(["10.1234/busy"]))
+        self.assertEqual(works["10.1234/busy"], WORKS["10.1234/busy"])
+        # One request through the rate limiter, retried by the session after Retry-After
+        self.assertEqual(len(waits), 1)
+        (first, _), (second, _) = self.server.requests
+        self.assertGreaterEqual(second - first, RETRY_AFTER * 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+import csv
+import math
+import os
+
+from fieds import WOS_FIELDS as fields
+from fieds import WOS_MULTIVALUE_FIELDS as multivalue_fields
+from fieds import WOS_NUMERIC_FIELDS as numeric_fields
+from fieds import WOS_COLUMN_ALIASES as column_aliases
+
+# Header and footer tags of an export; they repeat inside concatenated dumps
+WOS_FILE_TAGS = ("FN", "VR", "EF")
+WRITE_BATCH = 10000
+WOS_HEADER = "FN Clarivate Analytics Web of Science\nVR 1.0\n"
+# Buffer size of the exported text file
+WRITE_BUFFER = 1024 * 1024
+
+
+def iter_wos_records(path):
+    """
+    Stream the records of a Web of Science plain-text export.
+    Yields one {tag: [line, ...]} dict per record; continuation lines (indented)
+    are added to the tag above them. Only one record is held in memory at a time.
+    """
+    record = {}
+    tag = None
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n").lstrip("\ufeff")
+            if not line.strip():
+                continue
+            if line[0] in " \t":
+                if tag is not None:
+                    record[tag].append(line.strip())
+                continue
+
+            tag, value = line[:2], line[3:].strip()
+            if tag == "ER":
+                if record:
+                    yield record
+                record = {}
+                tag = None
+            elif tag in WOS_FILE_TAGS:
+                tag = None
+            else:
+                record.setdefault(tag, []).append(value)
+    if record:
+        yield record
+
+
+def parse_author(author):
+    # "Smith, J" -> "Smith J": the Authors column separates authors with commas
+    return " ".join(part.strip() for part in author.split(",") if part.strip())
+
+
+def record_to_row(record):
+    row = {}
+    for tag, column in fields.items():
+        lines = record.get(tag)
+        if not lines:
+            row[column] = None
+        elif tag == "AU":
+            row[column] = multivalue_fields[tag].join(parse_author(author) for author in lines)
+        elif tag in multivalue_fields:
+            row[column] = multivalue_fields[tag].join(lines)
+        elif tag in numeric_fields:
+            try:
+                row[column] = int(lines[0])
+            except ValueError:
+                row[column] = None
+        else:
+            row[column] = " ".join(lines)
+    return row
+
+
+def iter_wos_rows(path):
+    for record in iter_wos_records(path):
+        yield record_to_row(record)
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_rows_csv(rows, output_path):
+    columns = list(fields.values())
+    count = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for batch in batched(rows, WRITE_BATCH):
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+
+def write_rows_xlsx(rows, output_path):
+    from openpyxl import Workbook
+
+    columns = list(fields.values())
+    # Write-only workbooks stream rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(columns)
+    count = 0
+    for row in rows:
+        sheet.append([row[column] for column in columns])
+        count += 1
+    workbook.save(output_path)
+    return count
+
+
+def write_rows_parquet(rows, output_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (column, pa.int64() if tag in numeric_fields else pa.string())
+        for tag, column in fields.items()
+    ])
+    count = 0
+    with pq.ParquetWriter(output_path, schema) as writer:
+        for batch in batched(rows, WRITE_BATCH):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+WRITERS = {
+    ".csv": write_rows_csv,
+    ".xlsx": write_rows_xlsx,
+    ".parquet": write_rows_parquet,
+}
+
+
+def wos_to_excel(input_path, output_path):
+    """Convert a WoS plain-text export into an xlsx, csv or parquet table, chosen by the output extension."""
+    extension = os.path.splitext(output_path)[1].lower()
+    count = WRITERS[extension](iter_wos_rows(input_path), output_path)
+    print(f"Converted {count} records to {output_path}")
+    return count
+
+
+def iter_table_batches(path, batch_size=WRITE_BATCH):
+    """Read an xlsx, csv or parquet table in batches of row dicts."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        from openpyxl import load_workbook
+
+        # Read-only workbooks load rows lazily instead of parsing the whole sheet
+        workbook = load_workbook(path, read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = next(rows, ())
+        yield from batched((dict(zip(columns, row)) for row in rows), batch_size)
+        workbook.close()
+    elif extension == ".csv":
+        import pandas as pd
+
+        for chunk in pd.read_csv(path, chunksize=batch_size):
+            yield chunk.to_dict("records")
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported table format: {extension}")
+
+
+def column_tags(columns):
+    """Map each WoS tag to the first matching column of the table, in WOS_FIELDS order."""
+    tags = {}
+    for tag, column in fields.items():
+        for candidate in [column] + column_aliases.get(tag, []):
+            if candidate in columns:
+                tags[tag] = candidate
+                break
+    return tags
+
+
+def format_author(author):
+    # "Smith J" -> "Smith, J"
+    parts = author.strip().rsplit(" ", 1)
+    return ", ".join(parts)
+
+
+def is_empty(value):
+    return value is None or (isinstance(value, float) and math.isnan(value)) or str(value).strip() == ""
+
+
+def row_to_record(row, tags):
+    lines = []
+    for tag, column in tags.items():
+        value = row.get(column)
+        if is_empty(value):
+            continue
+        if tag == "AU":
+            values = [format_author(author) for author in str(value).split(",") if author.strip()]
+        elif tag in multivalue_fields:
+            separator = multivalue_fields[tag].strip()
+            values = [" ".join(item.split()) for item in str(value).split(separator) if item.strip()]
+        elif tag in numeric_fields:
+            try:
+                values = [str(int(float(value)))]
+            except ValueError:
+                continue
+        else:
+            values = [" ".join(str(value).split())]
+        if values:
+            lines.append(f"{tag} " + "\n   ".join(values) + "\n")
+    return "".join(lines) + "ER\n\n"
+
+
+def excel_to_wos(input_path, output_path):
+    """Export an xlsx, csv or parquet table to WoS plain-text format, one batch of rows at a time."""
+    count = 0
+    tags = None
+    with open(output_path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        f.write(WOS_HEADER)
+        for batch in iter_table_batches(input_path):
+            if tags is None and batch:
+                tags = column_tags(batch[0].keys())
+            f.write("".join(row_to_record(row, tags) for row in batch))
+            count += len(batch)
+        f.write("EF\n")
+    print(f"Exported {count} records to {output_path}")
+    return count